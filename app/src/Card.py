@@ -1,17 +1,21 @@
 from PyQt5.QtWidgets import (
     QWidget,
-    QScrollArea,
+    QListView,
+    QAbstractItemView,
     QComboBox,
     QPushButton,
     QLabel,
     QHBoxLayout,
     QVBoxLayout,
     QMessageBox,
+    QProgressBar,
 )
 from PyQt5.QtCore import Qt
 
 from TopBar import ItemDelegate
 from MsgDialog import MsgDialog
+from ResultsModel import ResultsModel
+from ResultDelegate import ResultDelegate
 
 
 class Card(QWidget):
@@ -118,9 +122,25 @@ class Card(QWidget):
         self.predict_button.setFixedSize(self.BUTTON_WIDTH, self.BUTTON_HEIGHT)
         self.predict_button.setCursor(Qt.PointingHandCursor)
 
+        # Cancel button (visible while prediction is running)
+        self.cancel_button = QPushButton()
+        self.cancel_button.setFixedSize(self.BUTTON_WIDTH, self.BUTTON_HEIGHT)
+        self.cancel_button.setCursor(Qt.PointingHandCursor)
+        self.cancel_button.setVisible(False)
+
         predict_layout.addWidget(self.predict_button)
+        predict_layout.addWidget(self.cancel_button)
         predict_layout.addStretch()
 
+        # Prediction progress
+        self.progress_bar = QProgressBar()
+        self.progress_bar.setFixedSize(
+            self.BUTTON_WIDTH * 2 + self.scale_manager.scale_value(10),
+            self.scale_manager.scale_value(25),
+        )
+        self.progress_bar.setAlignment(Qt.AlignCenter)
+        self.progress_bar.setVisible(False)
+
         # Disclaimer
         disclaimer_layout = QHBoxLayout()
         disclaimer_layout.setAlignment(Qt.AlignLeft)
@@ -147,6 +167,7 @@ class Card(QWidget):
         self.left_column.addWidget(self.step2_label)
         self.left_column.addWidget(self.step2_desc)
         self.left_column.addLayout(predict_layout)
+        self.left_column.addWidget(self.progress_bar)
         self.left_column.addStretch()
         self.left_column.addLayout(disclaimer_layout)
 
@@ -186,27 +207,28 @@ class Card(QWidget):
         sort_layout.addWidget(self.sort_label)
         sort_layout.addWidget(self.sort_by)
 
-        # Result(s) panel
-        self.results_card = QScrollArea()
+        # Result(s) panel - virtualized list, rows are painted by ResultDelegate
+        self.results_model = ResultsModel(parent=self)
+        self.results_delegate = ResultDelegate(
+            window=self.window, scale_manager=self.scale_manager
+        )
+
+        self.results_card = QListView()
         self.results_card.setObjectName("results_card")
-        self.results_card.setWidgetResizable(True)
+        self.results_card.setModel(self.results_model)
+        self.results_card.setItemDelegate(self.results_delegate)
+        self.results_delegate.setParent(self.results_card)
+        self.results_delegate.attach(self.results_card)
+        self.results_card.setUniformItemSizes(True)
+        self.results_card.setSelectionMode(QAbstractItemView.NoSelection)
+        self.results_card.setFocusPolicy(Qt.NoFocus)
+        self.results_card.setMouseTracking(True)
+        self.results_card.setVerticalScrollMode(QAbstractItemView.ScrollPerPixel)
         self.results_card.setHorizontalScrollBarPolicy(Qt.ScrollBarAlwaysOff)
         self.results_card.setVerticalScrollBarPolicy(Qt.ScrollBarAsNeeded)
+        self.results_card.setSpacing(self.scale_manager.scale_value(5))
         self.results_card.setMinimumHeight(self.scale_manager.scale_value(300))
 
-        self.results_container = QWidget()
-        self.results_layout = QVBoxLayout(self.results_container)
-        self.results_layout.setContentsMargins(
-            self.scale_manager.scale_value(15),
-            self.scale_manager.scale_value(15),
-            self.scale_manager.scale_value(15),
-            self.scale_manager.scale_value(15),
-        )
-        self.results_layout.setSpacing(self.scale_manager.scale_value(10))
-        self.results_layout.setAlignment(Qt.AlignTop)
-
-        self.results_card.setWidget(self.results_container)
-
         self.right_column.addWidget(self.step3_label)
         self.right_column.addWidget(self.step3_desc)
         self.right_column.addLayout(sort_layout)
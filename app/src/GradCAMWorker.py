@@ -0,0 +1,36 @@
+import traceback
+
+from PyQt5.QtCore import QThread, pyqtSignal
+
+
+class GradCAMWorker(QThread):
+    """
+    Generates Grad-CAM visualizations in a background thread. Results land in
+    the classifier's cache, so reopening the same file is instant
+    """
+
+    ready = pyqtSignal(str, object)  # filepath, Grad-CAM result
+    failed = pyqtSignal(str, object, str)  # filepath, exception, traceback
+
+    def __init__(self, classifier, filepaths, parent=None):
+        super().__init__(parent)
+
+        self.classifier = classifier
+        self.filepaths = filepaths
+        self.cancelled = False
+
+    def cancel(self):
+        """Stop after the current picture"""
+        self.cancelled = True
+
+    def run(self):
+        for filepath in self.filepaths:
+            if self.cancelled:
+                break
+
+            try:
+                res = self.classifier.explain_file(filepath)
+                self.ready.emit(filepath, res)
+
+            except Exception as e:
+                self.failed.emit(filepath, e, traceback.format_exc())
@@ -0,0 +1,59 @@
+import logging
+import time
+import traceback
+
+from PyQt5.QtCore import QThread, pyqtSignal
+
+logger = logging.getLogger("neuron")
+
+
+class ModelLoader(QThread):
+    """
+    Imports PyTorch and loads the classifier in a background thread,
+    so the main window is painted before the model is ready
+    """
+
+    loaded = pyqtSignal(object)  # BrainTumorClassifier
+    failed = pyqtSignal(object, str)  # exception, traceback
+
+    def __init__(
+        self,
+        checkpoint_path,
+        precision="fp32",
+        backend="eager",
+        explain_predictions=False,
+        parent=None,
+    ):
+        super().__init__(parent)
+
+        self.checkpoint_path = checkpoint_path
+        self.precision = precision
+        self.backend = backend
+        self.explain_predictions = explain_predictions
+
+    def run(self):
+        try:
+            start = time.perf_counter()
+            from BrainTumorClassifier import BrainTumorClassifier
+
+            imported = time.perf_counter()
+            logger.info("Startup: torch/torchvision import %.3fs", imported - start)
+
+            classifier = BrainTumorClassifier(
+                self.checkpoint_path,
+                precision=self.precision,
+                backend=self.backend,
+                explain_predictions=self.explain_predictions,
+            )
+
+            logger.info(
+                "Startup: classifier load (%s, %s) %.3fs",
+                classifier.precision,
+                classifier.backend,
+                time.perf_counter() - imported,
+            )
+            self.loaded.emit(classifier)
+
+        except Exception as e:
+            logger.exception("Startup: classifier load failed")
+            self.failed.emit(e, traceback.format_exc())
@@ -0,0 +1,49 @@
+import time
+import traceback
+
+from PyQt5.QtCore import QThread, pyqtSignal
+
+
+class PredictionWorker(QThread):
+    """
+    Runs classification in a background thread, so the UI stays responsive
+    """
+
+    batch_ready = pyqtSignal(list)  # results of one mini-batch
+    progress = pyqtSignal(int, int, float)  # done, total, images per second
+    failed = pyqtSignal(object, str)  # exception, traceback
+
+    def __init__(self, classifier, img_paths, parent=None):
+        super().__init__(parent)
+
+        self.classifier = classifier
+        self.img_paths = img_paths
+        self.cancelled = False
+
+    def cancel(self):
+        """Stop after the mini-batch currently being processed"""
+        self.cancelled = True
+
+    def run(self):
+        total = len(self.img_paths)
+        done = 0
+        start = time.perf_counter()
+
+        predictions = self.classifier.iter_predictions(self.img_paths)
+        try:
+            for batch_res in predictions:
+                done += len(batch_res)
+                elapsed = time.perf_counter() - start
+
+                self.batch_ready.emit(batch_res)
+                self.progress.emit(done, total, done / elapsed if elapsed > 0 else 0.0)
+
+                if self.cancelled:
+                    break
+
+        except Exception as e:
+            self.failed.emit(e, traceback.format_exc())
+
+        finally:
+            # Drops prefetched pictures if the batch was cancelled
+            predictions.close()
@@ -0,0 +1,200 @@
+from PyQt5.QtWidgets import QStyledItemDelegate, QToolTip
+from PyQt5.QtCore import Qt, QEvent, QRect, QRectF, QSize, pyqtSignal
+from PyQt5.QtGui import QColor, QPainter, QFont
+
+from ResultsModel import ResultsModel
+
+
+class ResultDelegate(QStyledItemDelegate):
+    """
+    Paints colorful result card for the prediction (only visible rows are painted)
+    """
+
+    gradcam_requested = pyqtSignal(str)  # filepath
+
+    COLORS = {
+        "Light": {
+            "glioma_tumor": "#DA5F62",
+            "meningioma_tumor": "#F0B880",
+            "no_tumor": "#93F080",
+            "pituitary_tumor": "#F0F47A",
+            "text": "black",
+        },
+        "Dark": {
+            "glioma_tumor": "#982527",
+            "meningioma_tumor": "#AC6723",
+            "no_tumor": "#519A47",
+            "pituitary_tumor": "#A6A637",
+            "text": "#FFFAF2",
+        },
+    }
+
+    def __init__(self, window, scale_manager, parent=None):
+        super().__init__(parent)
+
+        self.window = window
+        self.scale_manager = scale_manager
+        self.show_bars = False
+        self.hovered_row = None
+
+    def attach(self, view):
+        """
+        Clears hover highlight when the mouse leaves the view or its rows are
+        replaced or reordered (hovered row would point to another result)
+        """
+        view.viewport().installEventFilter(self)
+        view.model().modelReset.connect(self.clear_hover)
+        view.model().layoutChanged.connect(self.clear_hover)
+
+    def clear_hover(self):
+        if self.hovered_row is None:
+            return
+
+        self.hovered_row = None
+        viewport = self.parent().viewport()
+        viewport.setCursor(Qt.ArrowCursor)
+        viewport.update()
+
+    def eventFilter(self, obj, event):
+        if event.type() == QEvent.Leave:
+            self.clear_hover()
+        return super().eventFilter(obj, event)
+
+    def sizeHint(self, option, index):
+        return QSize(option.rect.width(), self.scale_manager.scale_value(60))
+
+    def button_rect(self, rect):
+        """Magnifier (Grad-CAM) button area inside the card"""
+        size = self.scale_manager.scale_value(40)
+        return QRect(
+            rect.right() - self.scale_manager.scale_value(10) - size,
+            rect.center().y() - size // 2,
+            size,
+            size,
+        )
+
+    def paint(self, painter, option, index):
+        sm = self.scale_manager
+        colors = self.COLORS[self.window.theme_manager.current_theme]
+
+        pred = index.data(ResultsModel.ClassRole)
+        confidence = index.data(ResultsModel.ProbabilityRole)
+
+        painter.save()
+        painter.setRenderHint(QPainter.Antialiasing)
+
+        # Card background
+        rect = option.rect
+        painter.setPen(Qt.NoPen)
+        painter.setBrush(QColor(colors[pred]))
+        painter.drawRoundedRect(QRectF(rect), 15, 15)
+
+        font = QFont(option.font)
+        font.setPixelSize(sm.scale_font(16))
+        painter.setFont(font)
+        painter.setPen(QColor(colors["text"]))
+
+        spacing = sm.scale_value(10)
+        x = rect.left() + spacing
+
+        # Filename
+        name_rect = QRect(x, rect.top(), sm.scale_value(120), rect.height())
+        filename = painter.fontMetrics().elidedText(
+            index.data(ResultsModel.FilenameRole), Qt.ElideRight, name_rect.width()
+        )
+        painter.drawText(name_rect, Qt.AlignLeft | Qt.AlignVCenter, filename)
+        x = name_rect.right() + spacing
+
+        # Class name
+        class_rect = QRect(x, rect.top(), sm.scale_value(160), rect.height())
+        font.setBold(True)
+        painter.setFont(font)
+        painter.drawText(
+            class_rect, Qt.AlignLeft | Qt.AlignVCenter, self.window.get_text(pred)
+        )
+        font.setBold(False)
+        painter.setFont(font)
+
+        # Right side: [confidence bar] confidence label [button]
+        button_rect = self.button_rect(rect)
+        conf_rect = QRect(
+            button_rect.left() - spacing - sm.scale_value(280),
+            rect.top(),
+            sm.scale_value(280),
+            rect.height(),
+        )
+        painter.drawText(
+            conf_rect,
+            Qt.AlignRight | Qt.AlignVCenter,
+            f'{confidence*100:.2f}% {self.window.get_text("probability")}',
+        )
+
+        if self.show_bars:
+            bar_width, bar_height = sm.scale_size(160, 15)
+            bar_rect = QRectF(
+                conf_rect.left() - spacing - bar_width,
+                rect.center().y() - bar_height / 2,
+                bar_width,
+                bar_height,
+            )
+            painter.setPen(Qt.NoPen)
+            painter.setBrush(QColor("#D8D8D8"))
+            painter.drawRoundedRect(bar_rect, 2, 2)
+
+            chunk_rect = QRectF(bar_rect)
+            chunk_rect.setWidth(bar_width * int(confidence * 100) / 100)
+            painter.setBrush(QColor("#94D3FF"))
+            painter.drawRoundedRect(chunk_rect, 2, 2)
+
+        # Grad-CAM button
+        if self.hovered_row == index.row():
+            painter.setPen(Qt.NoPen)
+            painter.setBrush(QColor(255, 255, 255, 77))
+            painter.drawRoundedRect(QRectF(button_rect), 15, 15)
+
+        font.setPixelSize(sm.scale_font(24))
+        painter.setFont(font)
+        painter.setPen(QColor(colors["text"]))
+        painter.drawText(button_rect, Qt.AlignCenter, "🔍")
+
+        painter.restore()
+
+    def editorEvent(self, event, model, option, index):
+        if event.type() not in (QEvent.MouseMove, QEvent.MouseButtonRelease):
+            return super().editorEvent(event, model, option, index)
+
+        over_button = self.button_rect(option.rect).contains(event.pos())
+
+        if event.type() == QEvent.MouseMove:
+            hovered_row = index.row() if over_button else None
+            if hovered_row != self.hovered_row:
+                self.hovered_row = hovered_row
+                view = self.parent()
+                view.viewport().setCursor(
+                    Qt.PointingHandCursor if over_button else Qt.ArrowCursor
+                )
+                view.viewport().update()
+
+        elif (
+            event.type() == QEvent.MouseButtonRelease
+            and event.button() == Qt.LeftButton
+            and over_button
+        ):
+            self.gradcam_requested.emit(index.data(ResultsModel.FilepathRole))
+            return True
+
+        return super().editorEvent(event, model, option, index)
+
+    def helpEvent(self, event, view, option, index):
+        if event.type() == QEvent.ToolTip and self.button_rect(option.rect).contains(
+            event.pos()
+        ):
+            hint = (
+                "Show GradCAM visualization"
+                if self.window.current_language == "EN"
+                else "Pokaż mapę ciepła GradCAM"
+            )
+            QToolTip.showText(event.globalPos(), hint, view)
+            return True
+
+        return super().helpEvent(event, view, option, index)
@@ -0,0 +1,125 @@
+import os
+
+from PyQt5.QtCore import QAbstractListModel, QModelIndex, Qt
+
+
+class ResultsModel(QAbstractListModel):
+    """
+    Prediction results as a list model - rows are painted by ResultDelegate,
+    so no widget is created per result. Sorting only permutes row order
+    over precomputed sort keys.
+    """
+
+    FilepathRole = Qt.UserRole + 1
+    FilenameRole = Qt.UserRole + 2
+    ClassRole = Qt.UserRole + 3
+    ProbabilityRole = Qt.UserRole + 4
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+
+        self.results = []
+        self.filenames = []
+        # Sort keys, precomputed once per result
+        self.filename_keys = []
+        self.probabilities = []
+        # {class_name: sort key} of translated names, results' keys rebuilt
+        # only when it changes (language switch)
+        self.class_keys = None
+        self.class_sort_keys = []
+        # Displayed row -> index in self.results
+        self.order = []
+
+    def rowCount(self, parent=QModelIndex()):
+        if parent.isValid():
+            return 0
+        return len(self.results)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+
+        idx = self.order[index.row()]
+        res = self.results[idx]
+
+        if role == Qt.DisplayRole or role == self.FilenameRole:
+            return self.filenames[idx]
+        if role == self.FilepathRole:
+            return res["filepath"]
+        if role == self.ClassRole:
+            return res["class_name"]
+        if role == self.ProbabilityRole:
+            return res["probability"]
+
+        return None
+
+    def append_results(self, results):
+        """Add results at the end of the list (streamed mini-batches)"""
+        if not results:
+            return
+
+        first = len(self.results)
+        self.beginInsertRows(QModelIndex(), first, first + len(results) - 1)
+        self.add_results(results)
+        self.endInsertRows()
+
+    def set_results(self, results):
+        """Replace all results"""
+        self.beginResetModel()
+        self.results = []
+        self.filenames = []
+        self.filename_keys = []
+        self.probabilities = []
+        self.class_sort_keys = []
+        self.order = []
+        self.add_results(results)
+        self.endResetModel()
+
+    def add_results(self, results):
+        first = len(self.results)
+        filenames = [os.path.basename(res["filepath"]) for res in results]
+
+        self.results.extend(results)
+        self.filenames.extend(filenames)
+        self.filename_keys.extend(filename.lower() for filename in filenames)
+        self.probabilities.extend(res["probability"] for res in results)
+        if self.class_keys is not None:
+            self.class_sort_keys.extend(
+                self.class_keys[res["class_name"]] for res in results
+            )
+        self.order.extend(range(first, len(self.results)))
+
+    def clear(self):
+        self.set_results([])
+
+    def sort_results(self, key=None, reverse=False, class_keys=None):
+        """
+        Reorders rows in place.
+
+        Args:
+            key: None (default order), "filename", "class" or "probability"
+            reverse: Descending order
+            class_keys: {class_name: sort key} for "class" (translated names)
+        """
+        if key == "filename":
+            keys = self.filename_keys
+        elif key == "class":
+            if class_keys != self.class_keys:
+                self.class_keys = class_keys
+                self.class_sort_keys = [
+                    class_keys[res["class_name"]] for res in self.results
+                ]
+            keys = self.class_sort_keys
+        elif key == "probability":
+            keys = self.probabilities
+        else:
+            keys = None
+
+        self.layoutAboutToBeChanged.emit()
+        if keys is None:
+            self.order = list(range(len(self.results)))
+        else:
+            self.order = sorted(
+                range(len(self.results)), key=keys.__getitem__, reverse=reverse
+            )
+        self.layoutChanged.emit()
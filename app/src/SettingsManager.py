@@ -47,4 +47,28 @@ class SettingsManager:
     
     def set_window_state(self, state):
         """Sets window state (maximized/normal)"""
-        return self.settings.setValue("window_state", state)
\ No newline at end of file
+        return self.settings.setValue("window_state", state)
+    
+    def get_precision(self):
+        """Returns inference precision (fp32/int8)"""
+        return self.settings.value("precision", "fp32") # Rollback to fp32 (default) if precision is not specified
+    
+    def set_precision(self, precision):
+        """Sets inference precision (fp32/int8)"""
+        self.settings.setValue("precision", precision)
+    
+    def get_backend(self):
+        """Returns inference backend (eager/compiled/torchscript/onnxruntime)"""
+        return self.settings.value("backend", "eager") # Rollback to eager (default) if backend is not specified
+    
+    def set_backend(self, backend):
+        """Sets inference backend"""
+        self.settings.setValue("backend", backend)
+
+    def get_explain_predictions(self):
+        """Returns whether prediction keeps activations for fast Grad-CAM"""
+        return self.settings.value("explain_predictions", False, type=bool) # Rollback to off (default) if not specified
+
+    def set_explain_predictions(self, enabled):
+        """Sets explainable prediction mode"""
+        self.settings.setValue("explain_predictions", enabled)
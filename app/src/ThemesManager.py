@@ -85,6 +85,7 @@ class ThemesManager:
             button_style
         )
         self.window.card.export_button.setStyleSheet(button_style)
+        self.window.card.cancel_button.setStyleSheet(button_style)
         
     def _apply_res_card_style(self, colors):
         self.window.card.results_card.setStyleSheet(
@@ -94,6 +95,7 @@ class ThemesManager:
                 color: {colors["text"]};
                 border-radius: 10px;
                 border: none;
+                padding: 10px;
             }}
             QScrollBar:vertical {{
                 background: {colors["vscroll-background"]};
@@ -110,10 +112,7 @@ class ThemesManager:
             }}
         """
         )
-        
-        self.window.card.results_container.setStyleSheet(
-            f"background-color: transparent;"
-        )
+
         
     def _apply_labels_style(self, colors):
         font_large = self.scale_manager.scale_font(20)
@@ -0,0 +1,74 @@
+import os
+from collections import OrderedDict
+
+from PyQt5.QtCore import Qt
+from PyQt5.QtGui import QImageReader, QPixmap
+
+
+class ThumbnailCache:
+    """
+    LRU cache of downscaled previews. Each file is decoded once at a bounded
+    size (reduced JPEG decode), later resizes only rescale the cached image.
+    """
+
+    def __init__(self, max_size=150, capacity=64):
+        """
+        Args:
+            max_size: Longest side of the decoded image in pixels
+            capacity: Number of images kept in memory
+        """
+        self.max_size = max_size
+        self.capacity = capacity
+        self.images = OrderedDict()
+
+    def get_image(self, filepath):
+        """
+        Returns cached QImage for the file (None if it can't be read).
+        """
+        try:
+            stat = os.stat(filepath)
+        except OSError:
+            return None
+
+        # Changed file (mtime/size) gets a new entry, old one ages out
+        key = (filepath, stat.st_mtime_ns, stat.st_size, self.max_size)
+        if key in self.images:
+            self.images.move_to_end(key)
+            return self.images[key]
+
+        reader = QImageReader(filepath)
+        reader.setAutoTransform(True)
+
+        size = reader.size()
+        if size.isValid() and (
+            size.width() > self.max_size or size.height() > self.max_size
+        ):
+            # JPEG plugin decodes directly at reduced scale
+            reader.setScaledSize(
+                size.scaled(self.max_size, self.max_size, Qt.KeepAspectRatio)
+            )
+
+        image = reader.read()
+        if image.isNull():
+            return None
+
+        self.images[key] = image
+        if len(self.images) > self.capacity:
+            self.images.popitem(last=False)
+
+        return image
+
+    def get_pixmap(self, filepath, size):
+        """
+        Returns thumbnail scaled to fit a size x size square.
+        """
+        image = self.get_image(filepath)
+        if image is None:
+            return None
+
+        return QPixmap.fromImage(
+            image.scaled(size, size, Qt.KeepAspectRatio, Qt.SmoothTransformation)
+        )
+
+    def clear(self):
+        self.images.clear()
@@ -16,6 +16,7 @@ class Translator:
             "selected_images": "Selected {count} images from {folder}",
             "no_jpg": "No .jpg files found in {folder}",
             "thinking": "Thinking...",
+            "progress_format": "{done}/{total} images ({speed:.1f} img/s)",
             "images": "images",
             "sort_by": "Sort by:",
             "sort_default": "Default order",
@@ -32,6 +33,7 @@ class Translator:
             "image_load_failed": "Image loading failed",
             "could_not_load": "Could not load the image",
             "visualization_error": "Visualization error has occurred",
+            "gradcam_computing": "Generating GradCAM...",
         },
         "PL": {
             "open_file": "Wybierz plik",
@@ -46,6 +48,7 @@ class Translator:
             "selected_images": "Wybrano {count} obrazów z {folder}",
             "no_jpg": "Brak plików .jpg w {folder}",
             "thinking": "Myślę...",
+            "progress_format": "{done}/{total} obrazów ({speed:.1f} obr./s)",
             "images": "obrazów",
             "sort_by": "Sortuj:",
             "sort_default": "Domyślnie",
@@ -62,6 +65,7 @@ class Translator:
             "image_load_failed": "Załadowanie obrazu nie powiodło się",
             "could_not_load": "Błąd podczas ładowania obrazu",
             "visualization_error": "Wystąpił błąd wizualizacji",
+            "gradcam_computing": "Generowanie mapy GradCAM...",
         },
     }
 
@@ -119,6 +123,7 @@ class Translator:
         self.current_window.card.step2_desc.setText("Poddaj obraz(y) ocenie")
 
         self.current_window.card.predict_button.setText("Uruchom")
+        self.current_window.card.cancel_button.setText("Anuluj")
 
         self.current_window.card.disclaimer_text.setText(
             'Neuron to oprogramowanie stworzone z myślą o wsparciu lekarzy i radiologów w diagnozowaniu <br>'
@@ -169,6 +174,7 @@ class Translator:
         self.current_window.card.step2_desc.setText("Examine image(s)")
 
         self.current_window.card.predict_button.setText("Predict")
+        self.current_window.card.cancel_button.setText("Cancel")
 
         self.current_window.card.disclaimer_text.setText(
             'Please note that Neuron is a software designed to support physicians and radiologists, and can make mistakes. <br>'
@@ -1,5 +1,10 @@
 import os
 import sys
+import time
+import logging
+
+# Startup timer (time to first paint is logged)
+STARTUP_TIME = time.perf_counter()
 
 # Project directories
 current_dir = os.path.dirname(os.path.abspath(__file__))  # app/src
@@ -12,8 +17,6 @@ CHECKPOINT_PATH = os.path.join(project_dir, "config", "resnet34.pth")
 
 sys.path.insert(0, utils_dir)
 
-from BrainTumorClassifier import BrainTumorClassifier
-from GradCAM import generate_gradcam
 
 # Set the Qt plugins' directory before Qt5 import (case for virtual environment)
 pyqt_path = os.path.join(sys.prefix, "Lib", "site-packages", "PyQt5", "Qt5", "plugins")
@@ -23,23 +26,18 @@ os.environ["QT_PLUGIN_PATH"] = pyqt_path
 from PyQt5.QtWidgets import (
     QApplication,
     QMainWindow,
-    QPushButton,
     QFileDialog,
     QVBoxLayout,
     QHBoxLayout,
     QWidget,
     QLabel,
-    QProgressBar,
     QDialog,
     QMessageBox,
     QSizePolicy,
 )
-from PyQt5.QtCore import QSize, QStandardPaths, Qt
+from PyQt5.QtCore import QSize, QStandardPaths, Qt, QTimer, QThread
 from PyQt5.QtGui import QPixmap, QImage
 
-import numpy as np
-import cv2
-from PIL import Image
 import traceback
 from datetime import datetime
 import csv
@@ -51,6 +49,12 @@ from Translator import Translator
 from Card import Card
 from ScaleManager import ScaleManager
 from SettingsManager import SettingsManager
+from PredictionWorker import PredictionWorker
+from GradCAMWorker import GradCAMWorker
+from ModelLoader import ModelLoader
+from ThumbnailCache import ThumbnailCache
+
+logger = logging.getLogger("neuron")
 
 QApplication.setAttribute(Qt.AA_UseHighDpiPixmaps, True)
 
@@ -59,6 +63,7 @@ class MainWindow(QMainWindow):
     def __init__(self):
         super().__init__()
         self.MIN_WIDTH = 1700
+        self.GRADCAM_PREFETCH = 4  # Grad-CAMs precomputed after prediction
 
         self.scale_manager = ScaleManager()
         self.settings_manager = SettingsManager()
@@ -72,13 +77,24 @@ class MainWindow(QMainWindow):
         self.selected_file = None
         self.selected_files = []
         self.selected_directory = None
+        # Decoded at the largest preview size (see get_preview_size)
+        self.thumbnail_cache = ThumbnailCache(max_size=150)
+        self.thumbnails_size = None
+
+        self.resize_timer = QTimer(self)
+        self.resize_timer.setSingleShot(True)
+        self.resize_timer.setInterval(100)
+        self.resize_timer.timeout.connect(self.apply_resize)
 
         self.predict_enabled = False
-        self.classifier = BrainTumorClassifier(CHECKPOINT_PATH)
+        self.classifier = None  # loaded in background by ModelLoader
+        self.prediction_worker = None
+        self.pending_results = []
+        self.gradcam_workers = []
+        self.gradcam_prefetch_worker = None
 
         self.last_results = None
         self.result_type = None
-        self.sorted_results = None
 
         # Window properties
         self.setWindowTitle("Neuron Desktop App")
@@ -123,7 +139,9 @@ class MainWindow(QMainWindow):
         self.card.dir_button.clicked.connect(self.open_directory)
         self.card.clear_button.clicked.connect(self.clear_selection)
         self.card.predict_button.clicked.connect(self.predict)
+        self.card.cancel_button.clicked.connect(self.cancel_prediction)
         self.card.sort_by.currentIndexChanged.connect(self.sort_results)
+        self.card.results_delegate.gradcam_requested.connect(self.show_gradcam_window)
 
         # Wrapper + margins
         card_wrapper = QWidget()
@@ -155,6 +173,44 @@ class MainWindow(QMainWindow):
 
         self.setCentralWidget(central_widget)
 
+        # Heavy imports + checkpoint load once the window is up
+        self.model_loader = ModelLoader(
+            CHECKPOINT_PATH,
+            precision=self.settings_manager.get_precision(),
+            backend=self.settings_manager.get_backend(),
+            explain_predictions=self.settings_manager.get_explain_predictions(),
+            parent=self,
+        )
+        self.model_loader.loaded.connect(self.on_model_loaded)
+        self.model_loader.failed.connect(self.on_model_failed)
+        self.model_loader.start()
+
+    def on_model_loaded(self, classifier):
+        self.classifier = classifier
+        logger.info(
+            "Startup: model ready %.3fs after launch",
+            time.perf_counter() - STARTUP_TIME,
+        )
+        self.update_predict_button()
+
+    def on_model_failed(self, error, error_traceback):
+        title = (
+            "Model loading failed"
+            if self.current_language == "EN"
+            else "Załadowanie modelu nie powiodło się"
+        )
+        MsgDialog(
+            parent=self, title=title, msg=error_traceback, type=QMessageBox.Critical
+        )
+
+    def update_predict_button(self):
+        """
+        Predict is available when files are selected and the model is loaded.
+        """
+        self.card.predict_button.setEnabled(
+            self.predict_enabled and self.classifier is not None
+        )
+
     def open_file(self):
         """
         Opens a file dialog for selecting one or more JPG images.
@@ -225,7 +281,7 @@ class MainWindow(QMainWindow):
 
         # Enable predict button
         self.predict_enabled = True
-        self.card.predict_button.setEnabled(self.predict_enabled)
+        self.update_predict_button()
 
         # Enable clear button
         self.card.clear_button.setVisible(True)
@@ -275,7 +331,7 @@ class MainWindow(QMainWindow):
             self.card.clear_button.setEnabled(True)
 
             self.predict_enabled = True
-            self.card.predict_button.setEnabled(self.predict_enabled)
+            self.update_predict_button()
         else:
             self.selected_files = []
             self.selected_directory = None
@@ -284,43 +340,92 @@ class MainWindow(QMainWindow):
                 {self.get_text("no_jpg", folder=os.path.basename(dirname))}
             )
             self.predict_enabled = False
-            self.card.predict_button.setEnabled(self.predict_enabled)
+            self.update_predict_button()
             self.card.clear_button.setVisible(False)
             self.card.clear_thumbnails()
 
     def predict(self):
         """
-        Runs prediction for uploaded data.
+        Runs prediction for uploaded data in a background worker.
         """
-        if not self.predict_enabled:
+        if (
+            not self.predict_enabled
+            or self.classifier is None
+            or self.prediction_worker is not None
+        ):
+            return
+
+        if self.selected_file:
+            img_paths = [self.selected_file]
+            self.result_type = "single"
+        elif self.selected_files:
+            img_paths = self.selected_files
+            self.result_type = "batch"
+            self.start_batch_res()
+        else:
             return
 
+        self.pending_results = []
+        self.last_results = None
+        # Prediction gets the CPU/GPU
+        self.cancel_gradcam_prefetch()
+
         self.card.predict_button.setText(self.get_text("thinking"))
+        self.card.predict_button.setEnabled(False)
         self.card.clear_button.setEnabled(False)
+        self.card.file_button.setEnabled(False)
+        self.card.dir_button.setEnabled(False)
+        self.card.sort_by.setEnabled(False)
+
+        self.card.cancel_button.setVisible(True)
+        self.card.cancel_button.setEnabled(True)
+        self.card.progress_bar.setMaximum(len(img_paths))
+        self.card.progress_bar.setValue(0)
+        self.card.progress_bar.setFormat("")
+        self.card.progress_bar.setVisible(True)
+
+        self.prediction_worker = PredictionWorker(
+            classifier=self.classifier, img_paths=img_paths, parent=self
+        )
+        self.prediction_worker.batch_ready.connect(self.on_batch_ready)
+        self.prediction_worker.progress.connect(self.on_prediction_progress)
+        self.prediction_worker.failed.connect(self.on_prediction_failed)
+        self.prediction_worker.finished.connect(self.on_prediction_finished)
+        self.prediction_worker.start()
 
-        # Refresh app before long processing operation
-        QApplication.processEvents()
-        try:
-            if self.selected_file:
-                res = self.classifier.predict(self.selected_file)
-                res["filepath"] = self.selected_file
-                self.show_single_res(res)
-                self.result_type = "single"
-
-            elif self.selected_files:
-                res = self.classifier.predict_batch(self.selected_files)
-                self.show_batch_res(res)
-                self.result_type = "batch"
-
-            self.last_results = res
-            self.card.export_button.setEnabled(True)
+    def cancel_prediction(self):
+        """
+        Stops running prediction after the current mini-batch.
+        """
+        if self.prediction_worker is None:
+            return
 
-        except ValueError as e:
-            title = (
-                "Execution failed"
-                if self.current_language == "EN"
-                else "Wykonanie nie powiodło się"
-            )
+        self.prediction_worker.cancel()
+        self.card.cancel_button.setEnabled(False)
+
+    def on_batch_ready(self, batch_res):
+        self.pending_results.extend(batch_res)
+
+        if self.result_type == "single":
+            self.show_single_res(batch_res[0])
+        else:
+            # Render each mini-batch as soon as it is classified
+            self.append_batch_res(batch_res)
+
+    def on_prediction_progress(self, done, total, speed):
+        self.card.progress_bar.setValue(done)
+        self.card.progress_bar.setFormat(
+            self.get_text("progress_format", done=done, total=total, speed=speed)
+        )
+
+    def on_prediction_failed(self, error, error_traceback):
+        title = (
+            "Execution failed"
+            if self.current_language == "EN"
+            else "Wykonanie nie powiodło się"
+        )
+
+        if isinstance(error, ValueError):
             error_msg = (
                 (
                     f"Image resolution too low.\n"
@@ -332,67 +437,61 @@ class MainWindow(QMainWindow):
                     f"Wymagane minimum: ({self.classifier.image_size[0]}x{self.classifier.image_size[1]})px"
                 )
             )
-            MsgDialog(
-                parent=self, title=title, msg=error_msg, type=QMessageBox.Critical
-            )
+        else:
+            error_msg = error_traceback
 
-        except Exception as e:
-            title = (
-                "Execution failed"
-                if self.current_language == "EN"
-                else "Wykonanie nie powiodło się"
-            )
-            error_msg = traceback.format_exc()
-            MsgDialog(
-                parent=self, title=title, msg=error_msg, type=QMessageBox.Critical
-            )
+        MsgDialog(parent=self, title=title, msg=error_msg, type=QMessageBox.Critical)
 
-        finally:
-            label = "Predict" if self.current_language == "EN" else "Uruchom"
-            self.card.sort_by.setCurrentIndex(0)
-            self.card.predict_button.setText(label)
-            self.card.predict_button.setEnabled(True)
-            self.card.clear_button.setEnabled(True)
+    def on_prediction_finished(self):
+        self.prediction_worker.deleteLater()
+        self.prediction_worker = None
+
+        if self.pending_results:
+            self.prefetch_gradcam([res["filepath"] for res in self.pending_results])
+
+            if self.result_type == "single":
+                self.last_results = self.pending_results[0]
+            else:
+                self.last_results = self.pending_results
+            self.card.export_button.setEnabled(True)
+        else:
+            self.result_type = None
+        self.pending_results = []
+
+        label = "Predict" if self.current_language == "EN" else "Uruchom"
+        self.card.sort_by.setCurrentIndex(0)
+        self.card.sort_by.setEnabled(True)
+        self.card.predict_button.setText(label)
+        self.update_predict_button()
+        self.card.clear_button.setEnabled(True)
+        self.card.file_button.setEnabled(True)
+        self.card.dir_button.setEnabled(True)
+
+        self.card.cancel_button.setVisible(False)
+        self.card.progress_bar.setVisible(False)
 
     def refresh_results(self):
-        if self.last_results is None:
-            return
-        if self.result_type == "single":
-            self.show_single_res(self.last_results)
-        elif self.result_type == "batch":
-            self.show_batch_res(self.last_results)
+        # Rows are painted with current theme/language - repaint is enough
+        self.card.results_card.viewport().update()
 
     def show_single_res(self, res):
         """
         Display prediction for one image.
         """
         self.clear_results()
+        self.card.results_model.set_results([res])
 
-        card = self.create_res_card(
-            filename=os.path.basename(res["filepath"]),
-            filepath=self.selected_file,
-            pred=res["class_name"],
-            confidence=res["probability"],
-        )
-        self.card.results_layout.addWidget(card)
-        self.card.results_layout.addStretch()
-
-    def show_batch_res(self, res):
+    def start_batch_res(self):
         """
-        Display prediction for many images.
+        Prepare empty results card for incoming batch predictions.
         """
         self.clear_results()
 
-        for result in res:
-            card = self.create_res_card(
-                filename=os.path.basename(result["filepath"]),
-                filepath=result["filepath"],
-                pred=result["class_name"],
-                confidence=result["probability"],
-            )
-            self.card.results_layout.addWidget(card)
-
-        self.card.results_layout.addStretch()
+    def append_batch_res(self, res):
+        """
+        Add predictions at the end of the results list.
+        """
+        self.card.results_model.append_results(res)
 
     def change_theme(self, theme):
         # Save current theme setting
@@ -409,7 +508,6 @@ class MainWindow(QMainWindow):
         self.selected_file = None
         self.selected_files = []
         self.selected_directory = None
-        self.sorted_results = None
 
         self.card.preview_label.setVisible(True)
         self.card.preview_container.setVisible(False)
@@ -418,7 +516,7 @@ class MainWindow(QMainWindow):
         self.clear_thumbnails()
 
         self.predict_enabled = False
-        self.card.predict_button.setEnabled(self.predict_enabled)
+        self.update_predict_button()
 
         self.card.clear_button.setVisible(True)
         self.card.clear_button.setEnabled(False)
@@ -428,7 +526,6 @@ class MainWindow(QMainWindow):
         self.clear_results()
         self.last_results = None
         self.result_type = None
-        self.sort_results = None
 
     def get_preview_size(self):
         # Get 15% of current window size
@@ -441,31 +538,31 @@ class MainWindow(QMainWindow):
     def resizeEvent(self, event):
         super().resizeEvent(event)
 
-        # Scale thumbnails
-        self.update_thumbnails_size()
-        # Show confidence bars for larger windows
+        # Coalesce resize events - layout work runs once the user stops dragging
+        self.resize_timer.start()
+
+    def apply_resize(self):
+        # Scale thumbnails (only when preview size breakpoint changes)
+        if self.get_preview_size() != self.thumbnails_size:
+            self.update_thumbnails_size()
+        # Show confidence bars for larger windows (repaints only on change)
         self.update_confidence_bar_visibility()
 
     def update_thumbnails_size(self):
         preview_size = self.get_preview_size()
+        self.thumbnails_size = preview_size
 
         for i in range(self.card.thumbnails_layout.count()):
             widget = self.card.thumbnails_layout.itemAt(i).widget()
             if widget:
                 widget.setFixedSize(preview_size, preview_size)
 
-                # If filepath present, reload
+                # If filepath present, rescale cached thumbnail (no disk read)
                 filepath = widget.property("filepath")
                 if filepath:
-                    pixmap = QPixmap(filepath)
-                    if not pixmap.isNull():
-                        scaled = pixmap.scaled(
-                            preview_size,
-                            preview_size,
-                            Qt.KeepAspectRatio,
-                            Qt.SmoothTransformation,
-                        )
-                        widget.setPixmap(scaled)
+                    pixmap = self.thumbnail_cache.get_pixmap(filepath, preview_size)
+                    if pixmap is not None:
+                        widget.setPixmap(pixmap)
 
     def show_directory_preview(self, filepaths, number_of_previews=3):
         for filepath in filepaths[:number_of_previews]:
@@ -495,12 +592,9 @@ class MainWindow(QMainWindow):
         preview_size = self.get_preview_size()
         thumbnail.setFixedSize(preview_size, preview_size)
 
-        pixmap = QPixmap(filepath)
-        if not pixmap.isNull():
-            scaled = pixmap.scaled(
-                preview_size, preview_size, Qt.KeepAspectRatio, Qt.SmoothTransformation
-            )
-            thumbnail.setPixmap(scaled)
+        pixmap = self.thumbnail_cache.get_pixmap(filepath, preview_size)
+        if pixmap is not None:
+            thumbnail.setPixmap(pixmap)
 
         # Save filepath as a property of the thumbnail for refresh overhead
         thumbnail.setProperty("filepath", filepath)
@@ -515,284 +609,178 @@ class MainWindow(QMainWindow):
 
         self.clear_results()
 
-    def create_res_card(self, filepath, filename, pred, confidence):
+    def update_confidence_bar_visibility(self):
+        show_bars = self.width() > self.scale_manager.scale_value(self.MIN_WIDTH * 1.1)
+
+        if show_bars != self.card.results_delegate.show_bars:
+            self.card.results_delegate.show_bars = show_bars
+            self.card.results_card.viewport().update()
+
+    def show_gradcam_window(self, filepath):
         """
-        Create colorful result card for the pred.
+        Opens Grad-CAM dialog immediately, visualization is generated in the
+        background (or taken from the cache).
         """
-        colors = {
-            "Light": {
-                "glioma_tumor": "#DA5F62",
-                "meningioma_tumor": "#F0B880",
-                "no_tumor": "#93F080",
-                "pituitary_tumor": "#F0F47A",
-                "text": "black",
-            },
-            "Dark": {
-                "glioma_tumor": "#982527",
-                "meningioma_tumor": "#AC6723",
-                "no_tumor": "#519A47",
-                "pituitary_tumor": "#A6A637",
-                "text": "#FFFAF2",
-            },
-        }
-
-        current_theme = self.theme_manager.current_theme
-        card_color = colors[current_theme][pred]
+        # Imported on demand - keeps it off the startup path
+        import cv2
 
-        card = QWidget()
-        card.setAttribute(Qt.WA_StyledBackground, True)
-        card.setStyleSheet(
-            f"""
-            QWidget {{
-                background-color: {card_color};
-                border-radius: 15px;
-                font-size: {self.scale_manager.scale_font(16)}px;
-            }}
-            """
-        )
-        card.setFixedHeight(self.scale_manager.scale_value(60))
-
-        layout = QHBoxLayout(card)
-        layout.setContentsMargins(
-            self.scale_manager.scale_value(10),
-            self.scale_manager.scale_value(5),
-            self.scale_manager.scale_value(10),
-            self.scale_manager.scale_value(5),
+        gradcam_dialog = QDialog(self)
+        gradcam_dialog.setWindowTitle(
+            f'{self.get_text("gradcam_title")} {os.path.basename(filepath)}'
         )
-        layout.setSpacing(self.scale_manager.scale_value(10))
+        gradcam_dialog.setMinimumSize(600, 300)
 
-        name_label = QLabel(filename)
-        name_label.setStyleSheet("background-color: transparent; border: none;")
-        name_label.setFixedWidth(self.scale_manager.scale_value(120))
-        name_label.setAlignment(Qt.AlignLeft | Qt.AlignVCenter)
+        gradcam_layout = QVBoxLayout(gradcam_dialog)
+        images_layout = QHBoxLayout()
 
-        class_label = QLabel(self.get_text(pred))
-        class_label.setStyleSheet(
-            "background-color: transparent; border: none; font-weight: bold;"
-        )
-        class_label.setFixedWidth(self.scale_manager.scale_value(160))
-        class_label.setAlignment(Qt.AlignLeft | Qt.AlignVCenter)
+        image_labels = []
 
-        # Confidence bar
-        confidence_bar = QProgressBar(card)
-        confidence_bar.setFixedSize(
-            self.scale_manager.scale_value(160), self.scale_manager.scale_value(15)
-        )
-        confidence_bar.setMinimum(0)
-        confidence_bar.setMaximum(100)
-        confidence_bar.setValue(int(confidence * 100))
-        confidence_bar.setTextVisible(False)
-        confidence_bar.setStyleSheet(
-            """
-            QProgressBar {
-                background-color: #D8D8D8;
-                border-radius: 2px;
-                border: none;
-            }
-            QProgressBar::chunk {
-                background-color: #94D3FF;
-                border-radius: 2px;
-            }
-        """
-        )
-        confidence_bar.setVisible(
-            self.width() >= self.scale_manager.scale_value(self.MIN_WIDTH * 1.1)
-        )
+        def create_img_container(title):
+            container = QVBoxLayout()
+            label = QLabel(title)
+            label.setAlignment(Qt.AlignCenter)
+            label.setStyleSheet("font-weight: bold;")
 
-        conf_label = QLabel(f'{confidence*100:.2f}% {self.get_text("probability")}')
-        conf_label.setStyleSheet("background-color: transparent; border: none;")
-        conf_label.setFixedWidth(self.scale_manager.scale_value(280))
-        conf_label.setAlignment(Qt.AlignRight | Qt.AlignVCenter)
+            img_lbl = QLabel()
+            img_lbl.setAlignment(Qt.AlignCenter)
+            img_lbl.setMinimumSize(200, 200)
+            img_lbl.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Expanding)
+            img_lbl.source_pixmap = None  # filled when Grad-CAM is ready
 
-        details_button = QPushButton("🔍")
-        details_button.setFixedSize(
-            self.scale_manager.scale_value(40), self.scale_manager.scale_value(40)
-        )
-        details_button.setCursor(Qt.PointingHandCursor)
-        hint = (
-            "Show GradCAM visualization"
-            if self.current_language == "EN"
-            else "Pokaż mapę ciepła GradCAM"
+            container.addWidget(label)
+            container.addWidget(img_lbl, 1)
+
+            image_labels.append(img_lbl)
+            return container
+
+        images_layout.addLayout(
+            create_img_container(
+                f'{self.get_text("original")}\n{os.path.basename(filepath)}'
+            )
         )
-        details_button.setToolTip(hint)
-        details_button.setStyleSheet(
-            f"""
-            QPushButton {{
-                background: transparent;
-                border: none;
-                font-size: {self.scale_manager.scale_font(24)}px;
-                border-radius: 10px;
-            }}
-            QPushButton:hover {{
-                background: rgba(255, 255, 255, 0.3);
-                border-radius: 15px;
-            }}
-        """
+        images_layout.addLayout(
+            create_img_container(
+                f'{self.get_text("heatmap")}\n{os.path.basename(filepath)}'
+            )
         )
-        details_button.clicked.connect(
-            lambda checked, f=filepath: self.show_gradcam_window(f)
+        images_layout.addLayout(
+            create_img_container(
+                f'{self.get_text("overlay")}\n{os.path.basename(filepath)}'
+            )
         )
 
-        layout.addWidget(name_label)
-        layout.addWidget(class_label)
-        layout.addStretch()
-        layout.addWidget(confidence_bar)
-        layout.addWidget(conf_label)
-        layout.addWidget(details_button)
-
-        card.confidence_bar = confidence_bar
-
-        return card
+        # Placeholder until the result arrives
+        info_label = QLabel(self.get_text("gradcam_computing"))
+        info_label.setAlignment(Qt.AlignCenter)
+        info_label.setStyleSheet(
+            f"font-size: {self.scale_manager.scale_font(18)}px; margin-top: 10px;"
+        )
 
-    def update_confidence_bar_visibility(self):
-        show_bars = self.width() > self.scale_manager.scale_value(self.MIN_WIDTH * 1.1)
+        gradcam_layout.addLayout(images_layout, 1)
+        gradcam_layout.addWidget(info_label)
 
-        for i in range(self.card.results_layout.count()):
-            item = self.card.results_layout.itemAt(i)
-            if item and item.widget():
-                card = item.widget()
-                # Check if card has confidence attribute
-                if hasattr(card, "confidence_bar"):
-                    card.confidence_bar.setVisible(show_bars)
+        def update_images():
+            for img in image_labels:
+                if img.source_pixmap is not None:
+                    size = img.size()
+                    scaled = img.source_pixmap.scaled(
+                        size, Qt.KeepAspectRatio, Qt.SmoothTransformation
+                    )
+                    img.setPixmap(scaled)
 
-    def show_gradcam_window(self, filepath):
-        self.setCursor(Qt.WaitCursor)
+        original_resize = gradcam_dialog.resizeEvent
 
-        try:
-            img_pil = Image.open(filepath).convert("RGB")
-            if img_pil is None:
-                title = (
-                    "Image loading failed"
-                    if self.current_language == "EN"
-                    else "Załadowanie obrazu nie powiodło się"
-                )
-                content = (
-                    "Could not load the image"
-                    if self.current_language == "EN"
-                    else "Błąd podczas ładowania obrazu"
-                )
-                error_msg = traceback.format_exc()
-                MsgDialog(
-                    parent=self,
-                    title=title,
-                    msg=lambda f=filepath: f"{content}: {f}\n{error_msg}",
-                    type=QMessageBox.Critical,
-                )
-                self.setCursor(Qt.ArrowCursor)
-                return
+        def new_resize(event):
+            if original_resize:
+                original_resize(event)
+            update_images()
 
-            img_resized = img_pil.resize(self.classifier.image_size)
-            img_np = np.array(img_resized)
+        gradcam_dialog.resizeEvent = new_resize
 
-            img_trans = self.classifier.transform(img_pil)
-            img_tensor = img_trans.unsqueeze(0).to(self.classifier.device)
+        gradcam_dialog.showEvent = lambda e: update_images()
 
-            res = generate_gradcam(
-                model=self.classifier.model,
-                img_tensor=img_tensor,
-                original_img=img_np,
-                device=self.classifier.device,
-            )
+        # Worker signals may arrive after the dialog is closed
+        dialog_state = {"open": True}
 
-            original_pixmap = self.rgb_to_pixmap(img_np)
-            heatmap_pixmap = self.rgb_to_pixmap(
-                cv2.cvtColor(res["heatmap"], cv2.COLOR_BGR2RGB)
-            )
-            superimposed_pixmap = self.rgb_to_pixmap(
-                cv2.cvtColor(res["superimposed"], cv2.COLOR_BGR2RGB)
-            )
+        def show_result(res):
+            pixmaps = [
+                self.rgb_to_pixmap(res["original"]),
+                self.rgb_to_pixmap(cv2.cvtColor(res["heatmap"], cv2.COLOR_BGR2RGB)),
+                self.rgb_to_pixmap(
+                    cv2.cvtColor(res["superimposed"], cv2.COLOR_BGR2RGB)
+                ),
+            ]
+            for img_lbl, pixmap in zip(image_labels, pixmaps):
+                img_lbl.source_pixmap = pixmap
 
-            gradcam_dialog = QDialog(self)
-            gradcam_dialog.setWindowTitle(
-                f'{self.get_text("gradcam_title")} {os.path.basename(filepath)}'
+            info_label.setText(
+                f'{self.get_text("prediction")}: {self.get_text(self.classifier.classes[res["class_index"]])} ({res["probability"]*100:.2f}%)'
             )
-            gradcam_dialog.setMinimumSize(600, 300)
-
-            gradcam_layout = QVBoxLayout(gradcam_dialog)
-            images_layout = QHBoxLayout()
-
-            image_labels = []
-
-            def create_img_container(title, pixmap):
-                container = QVBoxLayout()
-                label = QLabel(title)
-                label.setAlignment(Qt.AlignCenter)
-                label.setStyleSheet("font-weight: bold;")
+            update_images()
 
-                img_lbl = QLabel()
-                img_lbl.setAlignment(Qt.AlignCenter)
-                img_lbl.setMinimumSize(200, 200)
-                img_lbl.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Expanding)
-                img_lbl.pixmap = pixmap
+        def on_ready(ready_filepath, res):
+            if dialog_state["open"] and ready_filepath == filepath:
+                show_result(res)
 
-                container.addWidget(label)
-                container.addWidget(img_lbl, 1)
-
-                image_labels.append(img_lbl)
-                return container
+        def on_failed(failed_filepath, error, error_traceback):
+            if not dialog_state["open"] or failed_filepath != filepath:
+                return
 
-            original_container = create_img_container(
-                f'{self.get_text("original")}\n{os.path.basename(filepath)}',
-                original_pixmap,
-            )
-            heatmap_container = create_img_container(
-                f'{self.get_text("heatmap")}\n{os.path.basename(filepath)}',
-                heatmap_pixmap,
+            gradcam_dialog.reject()
+            title = (
+                "Visualization error has occured."
+                if self.current_language == "EN"
+                else "Wystąpił błąd wizualizacji."
             )
-            overlay_container = create_img_container(
-                f'{self.get_text("overlay")}\n{os.path.basename(filepath)}',
-                superimposed_pixmap,
+            MsgDialog(
+                parent=self, title=title, msg=error_traceback, type=QMessageBox.Critical
             )
 
-            images_layout.addLayout(original_container)
-            images_layout.addLayout(heatmap_container)
-            images_layout.addLayout(overlay_container)
-
-            info_label = QLabel(
-                f'{self.get_text("prediction")}: {self.get_text(self.classifier.classes[res["class_index"]])} ({res["probability"]*100:.2f}%)'
-            )
-            info_label.setAlignment(Qt.AlignCenter)
-            info_label.setStyleSheet(
-                f"font-size: {self.scale_manager.scale_font(18)}px; margin-top: 10px;"
-            )
+        res = self.classifier.get_cached_gradcam(filepath)
+        if res is not None:
+            show_result(res)
+        else:
+            worker = self.start_gradcam_worker([filepath])
+            worker.ready.connect(on_ready)
+            worker.failed.connect(on_failed)
 
-            gradcam_layout.addLayout(images_layout, 1)
-            gradcam_layout.addWidget(info_label)
+        gradcam_dialog.exec()
 
-            def update_images():
-                for img in image_labels:
-                    if hasattr(img, "pixmap"):
-                        size = img.size()
-                        scaled = img.pixmap.scaled(
-                            size, Qt.KeepAspectRatio, Qt.SmoothTransformation
-                        )
-                        img.setPixmap(scaled)
+        dialog_state["open"] = False
+        gradcam_dialog.deleteLater()
 
-            original_resize = gradcam_dialog.resizeEvent
+    def start_gradcam_worker(self, filepaths, priority=QThread.InheritPriority):
+        worker = GradCAMWorker(
+            classifier=self.classifier, filepaths=filepaths, parent=self
+        )
+        self.gradcam_workers.append(worker)
 
-            def new_resize(event):
-                if original_resize:
-                    original_resize(event)
-                update_images()
+        def on_finished():
+            self.gradcam_workers.remove(worker)
+            worker.deleteLater()
 
-            gradcam_dialog.resizeEvent = new_resize
+        worker.finished.connect(on_finished)
+        worker.start(priority)
 
-            gradcam_dialog.showEvent = lambda e: update_images()
+        return worker
 
-            self.setCursor(Qt.ArrowCursor)
-            gradcam_dialog.exec()
+    def prefetch_gradcam(self, filepaths):
+        """
+        Speculatively generates Grad-CAM for recently predicted files, so the
+        dialog opens with a ready visualization.
+        """
+        self.cancel_gradcam_prefetch()
 
-        except Exception as e:
-            title = (
-                "Visualization error has occured."
-                if self.current_language == "EN"
-                else "Wystąpił błąd wizualizacji."
-            )
-            error_msg = traceback.format_exc()
-            MsgDialog(
-                parent=self, title=title, msg=error_msg, type=QMessageBox.Critical
+        filepaths = filepaths[: self.GRADCAM_PREFETCH]
+        if filepaths:
+            self.gradcam_prefetch_worker = self.start_gradcam_worker(
+                filepaths, priority=QThread.LowestPriority
             )
-            self.setCursor(Qt.ArrowCursor)
+
+    def cancel_gradcam_prefetch(self):
+        if self.gradcam_prefetch_worker in self.gradcam_workers:
+            self.gradcam_prefetch_worker.cancel()
+        self.gradcam_prefetch_worker = None
 
     def rgb_to_pixmap(self, rgb_img):
         height, width, channel = rgb_img.shape
@@ -815,59 +803,35 @@ class MainWindow(QMainWindow):
         self.refresh_results()
         self.refresh_sort_combobox()
 
+        # Class order depends on translated names
+        if self.card.sort_by.currentIndex() in (3, 4):
+            self.sort_results(self.card.sort_by.currentIndex())
+
     def sort_results(self, index):
         if self.last_results is None or self.result_type == "single":
             return
 
-        res = self.last_results.copy()
-        if index == 0:
-            res = self.last_results.copy()
-        elif index == 1:
-            # Filename A-Z
-            res.sort(key=lambda x: os.path.basename(x["filepath"]).lower())
-        elif index == 2:
-            # Filename Z-A
-            res.sort(
-                key=lambda x: os.path.basename(x["filepath"]).lower(), reverse=True
-            )
-        elif index == 3:
-            # Classname A-Z
-            res.sort(
-                key=lambda x: os.path.basename(self.get_text(x["class_name"])).lower()
-            )
-        elif index == 4:
-            # Classname Z-A
-            res.sort(
-                key=lambda x: os.path.basename(self.get_text(x["class_name"])).lower(),
-                reverse=True,
-            )
-        elif index == 5:
-            # Confidence ASC
-            res.sort(key=lambda x: x["probability"])
-        elif index == 6:
-            # Confidence DESC
-            res.sort(key=lambda x: x["probability"], reverse=True)
-
-        self.sorted_results = res
-        self.rebuild_result_card()
-
-    def rebuild_result_card(self):
-        self.clear_results()
-        if self.sorted_results is None:
-            return
+        # Combo box index -> (sort key, descending)
+        sort_options = {
+            0: (None, False),  # Default order
+            1: ("filename", False),  # Filename A-Z
+            2: ("filename", True),  # Filename Z-A
+            3: ("class", False),  # Classname A-Z
+            4: ("class", True),  # Classname Z-A
+            5: ("probability", False),  # Confidence ASC
+            6: ("probability", True),  # Confidence DESC
+        }
+        key, reverse = sort_options.get(index, (None, False))
 
-        for res in self.sorted_results:
-            card = self.create_res_card(
-                filepath=res["filepath"],
-                filename=os.path.basename(res["filepath"]),
-                pred=res["class_name"],
-                confidence=res["probability"],
-            )
-            self.card.results_layout.addWidget(card)
+        # Translated class names - one lookup per class, not per result
+        class_keys = {
+            class_name: self.get_text(class_name).lower()
+            for class_name in self.classifier.classes
+        }
 
-        self.card.results_layout.addStretch()
-        self.update_confidence_bar_visibility()
-        self.card.export_button.setEnabled(True)
+        self.card.results_model.sort_results(
+            key=key, reverse=reverse, class_keys=class_keys
+        )
 
     def export_to_csv(self):
         if self.last_results is None:
@@ -952,15 +916,18 @@ class MainWindow(QMainWindow):
         Clears results card.
         """
         self.card.export_button.setEnabled(False)
-        while self.card.results_layout.count():
-            item = self.card.results_layout.takeAt(0)
-            if item.widget():
-                item.widget().deleteLater()
-            elif item.spacerItem():
-                pass
+        self.card.results_model.clear()
 
     def closeEvent(self, event):
         """Save window size and position before closing the app"""
+        if self.prediction_worker is not None:
+            self.prediction_worker.cancel()
+            self.prediction_worker.wait()
+        self.model_loader.wait()
+        for worker in list(self.gradcam_workers):
+            worker.cancel()
+            worker.wait()
+
         if self.isMaximized():
             self.settings_manager.set_window_state("maximized")
         else:
@@ -971,9 +938,21 @@ class MainWindow(QMainWindow):
         event.accept()
 
 
+logging.basicConfig(level=logging.INFO, format="%(asctime)s %(message)s")
+logger.info("Startup: UI imports %.3fs", time.perf_counter() - STARTUP_TIME)
+
 app = QApplication([])
 
 window = MainWindow()
+logger.info("Startup: window built %.3fs", time.perf_counter() - STARTUP_TIME)
 window.show()
 
+# Runs on the first event loop iteration, right after the window is painted
+QTimer.singleShot(
+    0,
+    lambda: logger.info(
+        "Startup: first paint %.3fs", time.perf_counter() - STARTUP_TIME
+    ),
+)
+
 app.exec()
@@ -0,0 +1,57 @@
+class BKTree:
+    """
+    Burkhard-Keller tree over integer hashes with Hamming distance. Finds all
+    hashes within a distance of a query without comparing against every item.
+    """
+
+    def __init__(self):
+        # Node: [hash, item, {distance: child node}]
+        self.root = None
+        self.size = 0
+
+    def __len__(self):
+        return self.size
+
+    @staticmethod
+    def distance(hash1, hash2):
+        """Hamming distance of two integer hashes"""
+        return bin(hash1 ^ hash2).count("1")
+
+    def add(self, hash_value, item):
+        """Insert item with its hash"""
+        self.size += 1
+        if self.root is None:
+            self.root = [hash_value, item, {}]
+            return
+
+        node = self.root
+        while True:
+            d = self.distance(hash_value, node[0])
+            child = node[2].get(d)
+            if child is None:
+                node[2][d] = [hash_value, item, {}]
+                return
+            node = child
+
+    def search(self, hash_value, max_distance):
+        """
+        Returns:
+            List of (distance, item) within max_distance, closest first
+        """
+        if self.root is None:
+            return []
+
+        matches = []
+        stack = [self.root]
+        while stack:
+            node = stack.pop()
+            d = self.distance(hash_value, node[0])
+            if d <= max_distance:
+                matches.append((d, node[1]))
+
+            # Triangle inequality - only these subtrees can hold matches
+            for child_distance, child in node[2].items():
+                if d - max_distance <= child_distance <= d + max_distance:
+                    stack.append(child)
+
+        return sorted(matches, key=lambda match: match[0])
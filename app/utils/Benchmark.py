@@ -0,0 +1,359 @@
+import json
+import os
+import subprocess
+import sys
+import time
+
+import torch
+import torch.nn.functional as F
+
+from ResNet34Model import ResNet34Model
+from VGG16Model import VGG16Model
+from EfficientNetModel import EfficientNetModel
+
+
+def measure(fn, repeats=3, warmup=0):
+    """
+    Runs `fn` and returns best wall time in seconds.
+    """
+    for _ in range(warmup):
+        fn()
+
+    times = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+
+    return min(times)
+
+
+def benchmark_model_construction(model_classes=None, repeats=3):
+    """
+    Compares model construction time with ImageNet weights (training mode)
+    and bare architecture (inference mode).
+
+    Returns:
+        Dictionary {model name: (pretrained seconds, bare seconds)}
+    """
+    model_classes = model_classes or [ResNet34Model, VGG16Model, EfficientNetModel]
+    results = {}
+
+    print(f"Model construction time (best of {repeats}):")
+    for model_class in model_classes:
+        # Warmup run also downloads the weights into torch cache if needed
+        pretrained_time = measure(
+            lambda: model_class(pretrained=True), repeats=repeats, warmup=1
+        )
+        bare_time = measure(lambda: model_class(pretrained=False), repeats=repeats)
+
+        results[model_class.__name__] = (pretrained_time, bare_time)
+        print(
+            f"\t{model_class.__name__}: pretrained {pretrained_time:.3f}s, "
+            f"bare {bare_time:.3f}s, saved {pretrained_time - bare_time:.3f}s"
+        )
+
+    return results
+
+
+# Loads checkpoint in a fresh interpreter, prints load time and peak RSS
+_LOAD_CHECKPOINT_SCRIPT = """
+import json, sys, time
+sys.path.insert(0, {utils_dir!r})
+start = time.perf_counter()
+from BrainTumorClassifier import BrainTumorClassifier
+BrainTumorClassifier({checkpoint_path!r}, use_inference_checkpoint={use_inference!r})
+elapsed = time.perf_counter() - start
+try:
+    import resource
+    peak_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+except ImportError:  # Windows
+    peak_rss = None
+print(json.dumps({{"seconds": elapsed, "peak_rss_mb": peak_rss}}))
+"""
+
+
+def benchmark_checkpoint_load(checkpoint_path, repeats=3):
+    """
+    Measures cold-start classifier load (torch import included) in separate
+    processes, with and without the exported inference checkpoint.
+
+    Returns:
+        Dictionary {"training"/"inference": {"seconds", "peak_rss_mb"}}
+    """
+    from CheckpointExporter import inference_checkpoint_path
+
+    utils_dir = os.path.dirname(os.path.abspath(__file__))
+    inference_path = inference_checkpoint_path(checkpoint_path)
+    if not os.path.exists(inference_path):
+        raise FileNotFoundError(
+            f"{inference_path} not found, run CheckpointExporter.py first"
+        )
+
+    def run_once(use_inference):
+        script = _LOAD_CHECKPOINT_SCRIPT.format(
+            utils_dir=utils_dir,
+            checkpoint_path=checkpoint_path,
+            use_inference=use_inference,
+        )
+        out = subprocess.run(
+            [sys.executable, "-c", script], capture_output=True, text=True, check=True
+        )
+        return json.loads(out.stdout.strip().splitlines()[-1])
+
+    results = {}
+    for mode, use_inference in [("training", False), ("inference", True)]:
+        runs = [run_once(use_inference) for _ in range(repeats)]
+        results[mode] = min(runs, key=lambda r: r["seconds"])
+
+    print(f"Classifier cold start (best of {repeats}):")
+    for mode, res in results.items():
+        rss = (
+            f"{res['peak_rss_mb']:.0f} MB" if res["peak_rss_mb"] is not None else "n/a"
+        )
+        print(f"\t{mode} checkpoint: {res['seconds']:.3f}s, peak RSS {rss}")
+
+    return results
+
+
+def benchmark_backends(
+    checkpoint_path,
+    backends=("eager", "compiled", "torchscript", "onnxruntime"),
+    batch_size=16,
+    repeats=10,
+    atol=1e-3,
+):
+    """
+    Compares inference backends of BrainTumorClassifier: latency of a single
+    picture, throughput of a mini-batch and max output difference to eager.
+
+    Returns:
+        Dictionary {backend: {"latency_ms", "throughput", "max_abs_diff", "match"}}
+    """
+    from BrainTumorClassifier import BrainTumorClassifier
+
+    reference = None
+    results = {}
+
+    for backend in backends:
+        classifier = BrainTumorClassifier(checkpoint_path, backend=backend)
+
+        if classifier.backend != backend:
+            # Missing/outdated export, onnxruntime not installed or compile
+            # failure (see log)
+            print(f"\t{backend}: skipped (fell back to {classifier.backend})")
+            continue
+
+        if reference is None:
+            torch.manual_seed(0)
+            single = torch.randn(1, 3, *classifier.image_size)
+            batch = torch.randn(batch_size, 3, *classifier.image_size)
+            reference = classifier.predict_logits(batch).cpu()
+
+        # Warmup also triggers compilation for the compiled backend
+        latency = measure(
+            lambda: classifier.predict_logits(single), repeats=repeats, warmup=3
+        )
+        batch_time = measure(
+            lambda: classifier.predict_logits(batch), repeats=repeats, warmup=1
+        )
+        max_abs_diff = (
+            (classifier.predict_logits(batch).cpu() - reference).abs().max().item()
+        )
+
+        results[backend] = {
+            "latency_ms": latency * 1000,
+            "throughput": batch_size / batch_time,
+            "max_abs_diff": max_abs_diff,
+            "match": max_abs_diff <= atol,
+        }
+
+    print(f"Inference backends (batch of {batch_size}, best of {repeats}):")
+    for backend, res in results.items():
+        print(
+            f"\t{backend}: latency {res['latency_ms']:.1f} ms, "
+            f"throughput {res['throughput']:.1f} img/s, "
+            f"max |diff| {res['max_abs_diff']:.2e} "
+            f"({'OK' if res['match'] else 'MISMATCH'})"
+        )
+
+    return results
+
+
+def reference_gradcam(activations, grads):
+    """
+    Previous per-channel loop implementation, kept as numerical reference.
+    """
+    pooled_grads = torch.mean(grads, dim=[0, 2, 3])
+    activations = activations.clone()
+
+    for i in range(activations.shape[1]):
+        activations[:, i, :, :] *= pooled_grads[i]
+
+    heatmap = torch.mean(activations, dim=1).squeeze()
+    heatmap = F.relu(heatmap)
+    heatmap /= heatmap.max()
+    return heatmap
+
+
+def check_cam_equivalence(batch_size=16, channels=512, size=7, atol=1e-6):
+    """
+    Checks vectorized compute_cam against the per-channel loop reference for
+    a batch of 1, a batch of `batch_size` and all-zero CAMs.
+
+    Raises:
+        AssertionError: If compute_cam drifts from reference_gradcam
+    """
+    from GradCAM import compute_cam
+
+    torch.manual_seed(0)
+    activations = torch.rand(batch_size, channels, size, size)
+    grads = torch.randn(batch_size, channels, size, size)
+
+    def max_abs_diff(cam, expected):
+        return (cam - expected).abs().max().item()
+
+    # Batch of 1
+    diff = max_abs_diff(
+        compute_cam(activations[:1], grads[:1])[0],
+        reference_gradcam(activations[:1], grads[:1]),
+    )
+    assert diff <= atol, f"Batch of 1: max |diff| {diff:.2e} > {atol:.0e}"
+
+    # Batch of N - reference pools gradients over its whole input, so it
+    # gets one picture at a time
+    cams = compute_cam(activations, grads)
+    for i in range(batch_size):
+        diff = max_abs_diff(
+            cams[i], reference_gradcam(activations[i : i + 1], grads[i : i + 1])
+        )
+        assert diff <= atol, (
+            f"Batch of {batch_size}, picture {i}: max |diff| {diff:.2e} > {atol:.0e}"
+        )
+
+    # All-zero CAM - reference divides 0 by 0 (NaN), compute_cam keeps zeros
+    # and leaves the other pictures of the batch untouched
+    zero_grads = grads.clone()
+    zero_grads[0] = 0
+    assert torch.isnan(reference_gradcam(activations[:1], zero_grads[:1])).all()
+    zero_cams = compute_cam(activations, zero_grads)
+    assert torch.equal(zero_cams[0], torch.zeros_like(zero_cams[0])), (
+        "All-zero CAM is not zero"
+    )
+    diff = max_abs_diff(zero_cams[1:], cams[1:])
+    assert diff <= atol, f"All-zero CAM changed other pictures: max |diff| {diff:.2e}"
+
+    print(f"CAM equivalence ({channels}x{size}x{size}): OK")
+
+
+def benchmark_cam(batch_size=16, channels=512, size=7, repeats=100, atol=1e-6):
+    """
+    Compares per-channel loop CAM with vectorized compute_cam (per picture and
+    whole batch) and checks both give the same heatmaps.
+
+    Returns:
+        Dictionary {"loop_ms", "vectorized_ms", "batch_ms", "max_abs_diff", "match"}
+    """
+    from GradCAM import compute_cam
+
+    torch.manual_seed(0)
+    activations = torch.rand(batch_size, channels, size, size)
+    grads = torch.randn(batch_size, channels, size, size)
+
+    max_abs_diff = max(
+        (
+            reference_gradcam(activations[i : i + 1], grads[i : i + 1])
+            - compute_cam(activations[i : i + 1], grads[i : i + 1])[0]
+        )
+        .abs()
+        .max()
+        .item()
+        for i in range(batch_size)
+    )
+
+    loop_time = measure(
+        lambda: reference_gradcam(activations[:1], grads[:1]), repeats, warmup=3
+    )
+    vectorized_time = measure(
+        lambda: compute_cam(activations[:1], grads[:1]), repeats, warmup=3
+    )
+    batch_time = measure(lambda: compute_cam(activations, grads), repeats, warmup=3)
+
+    results = {
+        "loop_ms": loop_time * 1000,
+        "vectorized_ms": vectorized_time * 1000,
+        "batch_ms": batch_time * 1000,
+        "max_abs_diff": max_abs_diff,
+        "match": max_abs_diff <= atol,
+    }
+
+    print(f"CAM computation ({channels}x{size}x{size}, best of {repeats}):")
+    print(
+        f"\tloop {results['loop_ms']:.3f} ms/img, "
+        f"vectorized {results['vectorized_ms']:.3f} ms/img, "
+        f"batch of {batch_size} {results['batch_ms']:.3f} ms, "
+        f"max |diff| {max_abs_diff:.2e} ({'OK' if results['match'] else 'MISMATCH'})"
+    )
+
+    return results
+
+
+def benchmark_hooks(batch_size=16, image_size=(224, 224), repeats=10):
+    """
+    Measures cost of always-on layer4 hooks of ResNet34Model: time of an
+    inference batch and a training step, and memory kept by the hooks
+    between batches.
+
+    Returns:
+        Dictionary {"hooks on"/"hooks off": {"inference_ms", "train_step_ms",
+        "retained_bytes"}}
+    """
+    torch.manual_seed(0)
+    imgs = torch.randn(batch_size, 3, *image_size)
+    labels = torch.randint(0, 4, (batch_size,))
+    results = {}
+
+    for register_hooks in (True, False):
+        model = ResNet34Model(pretrained=False, register_hooks=register_hooks)
+        optimizer = torch.optim.SGD(model.parameters(), lr=1e-3)
+        criterion = torch.nn.CrossEntropyLoss()
+
+        def inference():
+            model.eval()
+            with torch.no_grad():
+                model(imgs)
+
+        def train_step():
+            model.train()
+            optimizer.zero_grad()
+            criterion(model(imgs), labels).backward()
+            optimizer.step()
+
+        inference_time = measure(inference, repeats, warmup=1)
+        train_time = measure(train_step, repeats, warmup=1)
+        retained = sum(
+            tensor.nelement() * tensor.element_size()
+            for tensor in (model.activations, model.gradients)
+            if tensor is not None
+        )
+
+        results["hooks on" if register_hooks else "hooks off"] = {
+            "inference_ms": inference_time * 1000,
+            "train_step_ms": train_time * 1000,
+            "retained_bytes": retained,
+        }
+
+    print(f"Layer4 hooks (batch of {batch_size}, best of {repeats}):")
+    for name, res in results.items():
+        print(
+            f"\t{name}: inference {res['inference_ms']:.1f} ms, "
+            f"train step {res['train_step_ms']:.1f} ms, "
+            f"retained {res['retained_bytes'] / 1024:.0f} KiB"
+        )
+
+    return results
+
+
+if __name__ == "__main__":
+    check_cam_equivalence()
+    benchmark_model_construction()
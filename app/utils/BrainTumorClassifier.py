@@ -1,35 +1,156 @@
+import os
+import importlib.util
+import logging
+import threading
+from collections import OrderedDict
+from contextlib import closing
+from itertools import islice
+
 import torch
 from torchvision import transforms
-import cv2
 import torch.nn.functional as F
 import numpy as np
 from PIL import Image
 
 from HistogramEqualization import HistogramEqualization
+from GradCAM import GradCAMExplainer, compute_cam, gradcam_result
 from ResNet34Model import ResNet34Model
+from CheckpointExporter import (
+    DEFAULT_CLASSES,
+    artifact_matches_checkpoint,
+    inference_checkpoint_path,
+    load_inference_checkpoint,
+    matches_checkpoint,
+    quantized_checkpoint_path,
+)
+from ModelExporter import onnx_checkpoint_path, torchscript_checkpoint_path
+from Prefetch import iter_prefetched
+
+logger = logging.getLogger("neuron")
 
 
 class BrainTumorClassifier:
-    def __init__(self, checkpoint_path):
+    def __init__(
+        self,
+        checkpoint_path,
+        batch_size=16,
+        num_workers=None,
+        prefetch_batches=2,
+        use_inference_checkpoint=True,
+        precision="fp32",
+        backend="eager",
+        gradcam_cache_size=32,
+        explain_predictions=False,
+        explain_retain_size=64,
+    ):
+        self.checkpoint_path = checkpoint_path
         self.device = torch.device("cuda" if torch.cuda.is_available() else "cpu")
 
-        checkpoint = torch.load(
-            checkpoint_path, map_location=self.device, weights_only=False
-        )
+        if explain_predictions and (precision, backend) != ("fp32", "eager"):
+            # Explainable predict reuses activations of the fp32 eager model
+            logger.warning(
+                "Explainable predictions run on fp32 eager model, "
+                "ignoring %s precision and %s backend",
+                precision,
+                backend,
+            )
+            precision, backend = "fp32", "eager"
 
-        self.classes = checkpoint.get(
-            "classes",
-            ["glioma_tumor", "meningioma_tumor", "no_tumor", "pituitary_tumor"],
-        )  # load "classes" key, replace with list of classes if not available.
+        int8_path = quantized_checkpoint_path(checkpoint_path)
+        if precision == "int8":
+            problem = self.exported_model_problem(int8_path)
+            if problem is not None:
+                logger.warning("%s %s, falling back to fp32", int8_path, problem)
+                precision = "fp32"
+        if precision == "int8":
+            # Quantized kernels are CPU only
+            self.device = torch.device("cpu")
+        self.precision = precision
+
+        checkpoint = None
+        inference_path = inference_checkpoint_path(checkpoint_path)
+        if use_inference_checkpoint and os.path.exists(inference_path):
+            # Exported artifact: weights_only + mmap, no copy of the weights
+            checkpoint = load_inference_checkpoint(inference_path)
+
+            if not matches_checkpoint(checkpoint.get("source"), checkpoint_path):
+                logger.warning(
+                    "%s is outdated (not exported from current %s), "
+                    "loading training checkpoint",
+                    inference_path,
+                    checkpoint_path,
+                )
+                checkpoint = None
+
+        if checkpoint is not None:
+            with torch.device("meta"):
+                self.model = ResNet34Model(pretrained=False)
+            self.model.load_state_dict(checkpoint["weights"], assign=True)
+
+        else:
+            checkpoint = torch.load(
+                checkpoint_path, map_location=self.device, weights_only=False
+            )
+
+            # Bare architecture - checkpoint weights replace ImageNet ones anyway
+            self.model = ResNet34Model(pretrained=False)
+            self.model.load_state_dict(checkpoint["weights"])
 
-        self.model = ResNet34Model()
-        self.model.load_state_dict(checkpoint["weights"])
         self.model.to(self.device)
         self.model.eval()
+        # Hooks on self.model exist only while an explanation runs
+        self.explainer = GradCAMExplainer(self.model)
+
+        exported_paths = {
+            "torchscript": torchscript_checkpoint_path(checkpoint_path),
+            "onnxruntime": onnx_checkpoint_path(checkpoint_path),
+        }
+        if precision == "int8":
+            # Quantized model is a TorchScript artifact of its own
+            if backend != "torchscript":
+                logger.warning(
+                    "int8 precision runs on torchscript backend, ignoring %s", backend
+                )
+            backend = "torchscript"
+        elif backend in exported_paths:
+            problem = self.exported_model_problem(exported_paths[backend])
+            if problem is not None:
+                logger.warning(
+                    "%s %s, falling back to eager backend",
+                    exported_paths[backend],
+                    problem,
+                )
+                backend = "eager"
+        if backend == "onnxruntime" and importlib.util.find_spec("onnxruntime") is None:
+            logger.warning("onnxruntime not installed, falling back to eager backend")
+            backend = "eager"
+        self.backend = backend
+        # Needed by the compiled backend's warm-up pass
+        self.image_size = tuple(checkpoint["image_size"])
+        self.inference_model = self.load_inference_model(checkpoint_path)
+
+        self.classes = checkpoint.get(
+            "classes", DEFAULT_CLASSES
+        )  # load "classes" key, replace with list of classes if not available.
 
         mean = checkpoint["mean"]
         std = checkpoint["std"]
-        self.image_size = checkpoint["image_size"]
+        self.batch_size = batch_size
+        # Decode + preprocessing pool, runs ahead of the forward pass
+        self.num_workers = num_workers or min(4, os.cpu_count() or 1)
+        self.prefetch_batches = prefetch_batches
+        # Explainer hooks keep state on self.model (prediction uses the twin)
+        self.lock = threading.Lock()
+        # Grad-CAM results per (file, checkpoint), least recently used dropped
+        self.gradcam_cache = OrderedDict()
+        self.gradcam_cache_size = gradcam_cache_size
+        self.gradcam_cache_lock = threading.Lock()
+        # Explainable predict: prediction keeps resized picture + layer4
+        # activations, so Grad-CAM later costs only the head's backward pass
+        self.explain_predictions = explain_predictions
+        self.retained = OrderedDict()
+        self.retain_size = explain_retain_size
+        self.retained_lock = threading.Lock()
 
         self.transform = transforms.Compose(
             [
@@ -40,93 +161,341 @@ class BrainTumorClassifier:
             ]
         )
 
-    def validate_image_size(self, img_path, min_img_size=(120, 120)):
+    def exported_model_problem(self, artifact_path):
+        """
+        Returns why an exported model can't be used (None if it can).
+        """
+        if not os.path.exists(artifact_path):
+            return "not found"
+        if not artifact_matches_checkpoint(artifact_path, self.checkpoint_path):
+            return f"is outdated (not exported from current {self.checkpoint_path})"
+        return None
+
+    def load_inference_model(self, checkpoint_path):
         """
-        Check image resolution.
+        Builds network used for pure prediction, never reached by the
+        explainer's hooks. self.model stays the fp32 eager model used for
+        Grad-CAM.
+        """
+        if self.precision == "int8":
+            network = torch.jit.load(
+                quantized_checkpoint_path(checkpoint_path), map_location="cpu"
+            )
+            return network.eval()
+
+        if self.backend in ("eager", "compiled"):
+            # Twin module sharing parameter tensors with self.model (no copy),
+            # so explanations can't hook into concurrent predictions
+            with torch.device("meta"):
+                network = ResNet34Model(pretrained=False)
+            network.load_state_dict(self.model.state_dict(), assign=True)
+            network.eval()
+
+            if self.backend == "compiled":
+                compiled = torch.compile(network)
+                try:
+                    # Compilation is lazy - warm up now, so a missing compiler
+                    # shows here and not on the first prediction
+                    warmup = torch.zeros(1, 3, *self.image_size, device=self.device)
+                    with torch.no_grad():
+                        compiled(warmup)
+                except Exception as e:
+                    logger.warning(
+                        "torch.compile failed (%s), falling back to eager backend", e
+                    )
+                    self.backend = "eager"
+                    return network
+                return compiled
+            return network
+
+        if self.backend == "torchscript":
+            network = torch.jit.load(
+                torchscript_checkpoint_path(checkpoint_path), map_location=self.device
+            )
+            return network.eval()
+
+        if self.backend == "onnxruntime":
+            import onnxruntime as ort
+
+            providers = (
+                ["CUDAExecutionProvider", "CPUExecutionProvider"]
+                if self.device.type == "cuda"
+                else ["CPUExecutionProvider"]
+            )
+            return ort.InferenceSession(
+                onnx_checkpoint_path(checkpoint_path), providers=providers
+            )
+
+        raise ValueError(f"Unknown inference backend: {self.backend}")
+
+    def predict_logits(self, img_tensors):
+        """
+        Raw model output for stacked pictures [N, C, H, W] on selected backend.
+        """
+        if self.backend == "onnxruntime":
+            session = self.inference_model
+            out = session.run(
+                None, {session.get_inputs()[0].name: img_tensors.cpu().numpy()}
+            )[0]
+            return torch.from_numpy(out)
+
+        with torch.no_grad():
+            return self.inference_model(img_tensors.to(self.device))
+
+    def validate_image_size(self, img, min_img_size=(120, 120)):
+        """
+        Check image resolution. Works on a lazily opened picture, so only the
+        file header is read.
         """
-        img = Image.open(img_path).convert("RGB")
         w, h = img.size
 
         if w < min_img_size[0] or h < min_img_size[1]:
             raise ValueError()
 
-    def predict(self, img_path):
+    def open_image(self, img_path):
         """
-        Classifies single picture.
+        Opens picture once - resolution is validated from the header and pixel
+        data is decoded only for valid pictures.
         """
-        self.validate_image_size(img_path=img_path)
+        with Image.open(img_path) as img:
+            self.validate_image_size(img=img)
 
-        img = Image.open(img_path).convert("RGB")
+            return img.convert("RGB")
 
-        img_trans = self.transform(img)
-        img_tensor = img_trans.unsqueeze(0).to(self.device)
+    def load_image(self, img_path):
+        """
+        Loads picture and turns it into the model's input tensor.
+        """
+        return self.transform(self.open_image(img_path))
+
+    def prepare_image(self, img_path):
+        """
+        Loads picture as (input tensor, resized RGB picture for Grad-CAM).
+        """
+        img = self.open_image(img_path)
+        # image_size is (h, w) as in transforms.Resize, PIL takes (w, h)
+        return self.transform(img), np.array(img.resize(self.image_size[::-1]))
+
+    def retain(self, img_path, original, features):
+        """
+        Stores resized picture and layer4 activations of a predicted picture
+        for later Grad-CAM (bounded LRU, always both parts at once).
+        """
+        key = self.gradcam_cache_key(img_path)
+
+        with self.retained_lock:
+            self.retained[key] = {"original": original, "features": features}
+            self.retained.move_to_end(key)
+            if len(self.retained) > self.retain_size:
+                self.retained.popitem(last=False)
+
+    def predict_tensors(self, img_tensors, img_paths=None, originals=None):
+        """
+        Classifies stacked pictures [N, C, H, W] in a single forward pass.
+        In explain mode, layer4 activations are retained together with
+        `originals` (resized pictures) under `img_paths`.
+        """
         with torch.no_grad():
-            out = self.model(img_tensor)
+            if (
+                self.explain_predictions
+                and img_paths is not None
+                and originals is not None
+            ):
+                # fp32 eager model - its activations are what Grad-CAM needs
+                with self.lock:
+                    features = self.model.forward_features(
+                        img_tensors.to(self.device)
+                    )
+                    out = self.model.forward_head(features)
+
+                for img_path, original, sample_features in zip(
+                    img_paths, originals, features
+                ):
+                    # Clone - a row view would keep the whole batch alive
+                    self.retain(img_path, original, sample_features.clone())
+            else:
+                out = self.predict_logits(img_tensors)
+
             probs = torch.softmax(out, dim=1)
-            pred_idx = probs.argmax(dim=1).item()
-            confidence = probs[0, pred_idx].item()
+            confidences, pred_idxs = probs.max(dim=1)
 
-        return {
-            "class_name": self.classes[pred_idx],
-            "probability": confidence,
-        }
+        # One device -> host copy for the whole batch
+        confidences = confidences.cpu().tolist()
+        pred_idxs = pred_idxs.cpu().tolist()
+
+        return [
+            {
+                "class_name": self.classes[pred_idx],
+                "probability": confidence,
+            }
+            for pred_idx, confidence in zip(pred_idxs, confidences)
+        ]
+
+    def predict(self, img_path):
+        """
+        Classifies single picture.
+        """
+        if self.explain_predictions:
+            img_trans, original = self.prepare_image(img_path)
+            return self.predict_tensors(
+                img_trans.unsqueeze(0), [img_path], [original]
+            )[0]
+
+        img_trans = self.load_image(img_path)
 
-    def predict_batch(self, img_paths):
+        return self.predict_tensors(img_trans.unsqueeze(0))[0]
+
+    def iter_batches(
+        self, img_paths, batch_size=None, with_originals=False, on_error=None
+    ):
         """
-        Classifies batch of pictures.
+        Yields (paths, stacked tensors) mini-batches. Pictures are decoded and
+        preprocessed by a worker pool, at most `prefetch_batches` batches ahead
+        of the consumer. With `with_originals`, yields (paths, stacked
+        tensors, resized pictures).
+
+        Without `on_error`, an unreadable or too small picture raises. With
+        it, on_error(path, exception) is called and the picture is left out
+        of its batch.
+        """
+        batch_size = batch_size or self.batch_size
+        load = self.prepare_image if with_originals else self.load_image
+        max_pending = batch_size * (self.prefetch_batches + 1)
+
+        with closing(
+            iter_prefetched(load, img_paths, self.num_workers, max_pending)
+        ) as queue:
+            while True:
+                batch = list(islice(queue, batch_size))
+                if not batch:
+                    return
+
+                batch_paths = []
+                loaded = []
+                for img_path, future in batch:
+                    try:
+                        loaded.append(future.result())
+                    except Exception as e:
+                        if on_error is None:
+                            raise
+                        on_error(img_path, e)
+                        continue
+                    batch_paths.append(img_path)
+
+                if not loaded:
+                    continue
+                if with_originals:
+                    img_tensors = torch.stack([tensor for tensor, _ in loaded])
+                    yield batch_paths, img_tensors, [orig for _, orig in loaded]
+                else:
+                    yield batch_paths, torch.stack(loaded)
+
+    def iter_predictions(self, img_paths, batch_size=None):
+        """
+        Classifies batch of pictures lazily - yields list of results as soon as
+        each mini-batch is done.
+        """
+        for batch in self.iter_batches(
+            img_paths, batch_size, with_originals=self.explain_predictions
+        ):
+            if self.explain_predictions:
+                batch_paths, img_tensors, originals = batch
+            else:
+                (batch_paths, img_tensors), originals = batch, None
+
+            results = self.predict_tensors(img_tensors, batch_paths, originals)
+            for img_path, res in zip(batch_paths, results):
+                res["filepath"] = img_path
+
+            yield results
+
+    def predict_batch(self, img_paths, batch_size=None, on_batch=None):
+        """
+        Classifies batch of pictures in mini-batches of `batch_size` images.
+        Optional `on_batch` callback receives results of every finished mini-batch.
         """
         results = []
-        for img_path in img_paths:
-            res = self.predict(img_path)
-            res["filepath"] = img_path
-            results.append(res)
+        for batch_results in self.iter_predictions(img_paths, batch_size):
+            if on_batch is not None:
+                on_batch(batch_results)
+            results.extend(batch_results)
 
         return results
 
+    def gradcam_cache_key(self, img_path):
+        stat = os.stat(img_path)
+        return (img_path, stat.st_mtime_ns, stat.st_size, self.checkpoint_path)
+
+    def get_cached_gradcam(self, img_path):
+        """
+        Returns cached Grad-CAM result for the picture or None.
+        """
+        try:
+            key = self.gradcam_cache_key(img_path)
+        except OSError:
+            return None
+
+        with self.gradcam_cache_lock:
+            res = self.gradcam_cache.get(key)
+            if res is not None:
+                self.gradcam_cache.move_to_end(key)
+
+        return res
+
+    def explain_file(self, img_path):
+        """
+        Generates Grad-CAM for a picture file (cached).
+
+        Returns:
+            Dictionary as generate_gradcam plus "original" (resized RGB picture)
+        """
+        res = self.get_cached_gradcam(img_path)
+        if res is not None:
+            return res
+
+        key = self.gradcam_cache_key(img_path)
+
+        with self.retained_lock:
+            retained = self.retained.get(key)
+
+        if retained is not None:
+            # Explainable predict already did decode, transform and forward
+            original = retained["original"]
+            res = self.gradcam_from_features(retained["features"], original)
+        else:
+            img_tensor, original = self.prepare_image(img_path)
+
+            with self.lock:
+                res = self.generate_gradcam(img_tensor, original)
+        res["original"] = original
+
+        with self.gradcam_cache_lock:
+            self.gradcam_cache[key] = res
+            if len(self.gradcam_cache) > self.gradcam_cache_size:
+                self.gradcam_cache.popitem(last=False)
+
+        return res
+
     def generate_gradcam(self, img_tensor, original):
         """
         Generates GradCAM + overlay.
         """
-        self.model.eval()
-        img_tensor = (
-            img_tensor.unsqueeze(0).to(self.device)
-            if img_tensor.dim() == 3
-            else img_tensor.to(self.device)
-        )
+        return self.explainer.explain(img_tensor, original)
 
-        # Forward pass
-        out = self.model(img_tensor)
-        probs = F.softmax(out, dim=1)
-        class_index = out.argmax(dim=1).item()
-        confidence = probs[0, class_index].item()
-
-        # Backward pass
-        self.model.zero_grad()
-        out[:, class_index].backward()
-
-        # Grad-CAM
-        grads = self.model.get_activations_gradient()
-        pooled_grads = torch.mean(grads, dim=[0, 2, 3])
-        activations = self.model.get_activations().clone()
-
-        for i in range(activations.shape[1]):
-            activations[:, i, :, :] *= pooled_grads[i]
-
-        heatmap = torch.mean(activations, dim=1).squeeze()
-        heatmap = F.relu(heatmap)
-        heatmap /= heatmap.max()
-        heatmap = heatmap.cpu().numpy()
-
-        # Resize & overlay
-        heatmap_resized = cv2.resize(heatmap, (original.shape[1], original.shape[0]))
-        heatmap_uint8 = (heatmap_resized * 255).astype(np.uint8)
-        heatmap_colored = cv2.applyColorMap(heatmap_uint8, cv2.COLORMAP_JET)
-
-        superimposed = cv2.addWeighted(original, 0.6, heatmap_colored, 0.4, 0)
-
-        return {
-            "class_index": class_index,
-            "probability": confidence,
-            "heatmap": heatmap_colored,
-            "superimposed": superimposed,
-        }
+    def gradcam_from_features(self, features, original):
+        """
+        Grad-CAM from retained layer4 activations - gradients flow through
+        the classification head only (no decode, transform or backbone pass).
+        """
+        features = features.unsqueeze(0).to(self.device).requires_grad_(True)
+
+        with torch.enable_grad():
+            out = self.model.forward_head(features)
+            probs = F.softmax(out, dim=1)
+            class_index = out.argmax(dim=1).item()
+            confidence = probs[0, class_index].item()
+
+            grads = torch.autograd.grad(out[0, class_index], features)[0]
+
+        cam = compute_cam(features.detach(), grads)[0].cpu().numpy()
+        return gradcam_result(cam, original, class_index, confidence)
@@ -0,0 +1,187 @@
+import argparse
+import hashlib
+import json
+import os
+
+import torch
+
+INFERENCE_FORMAT = "neuron-inference-v1"
+DEFAULT_CLASSES = ["glioma_tumor", "meningioma_tumor", "no_tumor", "pituitary_tumor"]
+
+
+def inference_checkpoint_path(checkpoint_path):
+    """
+    Returns path of the inference artifact exported next to training checkpoint
+    (config/resnet34.pth -> config/resnet34_inference.pth).
+    """
+    root, ext = os.path.splitext(checkpoint_path)
+    return f"{root}_inference{ext}"
+
+
+def quantized_checkpoint_path(checkpoint_path):
+    """
+    Returns path of the INT8 model exported next to training checkpoint
+    (config/resnet34.pth -> config/resnet34_int8.pt).
+    """
+    root, _ = os.path.splitext(checkpoint_path)
+    return f"{root}_int8.pt"
+
+
+# SHA-256 per (path, size, mtime_ns) - inference, int8 and backend artifacts
+# are checked against the same checkpoint at startup
+_sha256_cache = {}
+
+
+def file_sha256(path):
+    stat = os.stat(path)
+    key = (os.path.abspath(path), stat.st_size, stat.st_mtime_ns)
+    if key in _sha256_cache:
+        return _sha256_cache[key]
+
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(chunk)
+    _sha256_cache[key] = digest.hexdigest()
+    return _sha256_cache[key]
+
+
+def checkpoint_fingerprint(checkpoint_path):
+    """
+    Identifies the training checkpoint an artifact was exported from.
+    """
+    stat = os.stat(checkpoint_path)
+    return {
+        "size": int(stat.st_size),
+        "mtime_ns": int(stat.st_mtime_ns),
+        "sha256": file_sha256(checkpoint_path),
+    }
+
+
+def matches_checkpoint(fingerprint, checkpoint_path):
+    """
+    Checks that an artifact was exported from the current training
+    checkpoint. The file is hashed only if its mtime changed (e.g. copied).
+    """
+    if not os.path.exists(checkpoint_path):
+        # Deployed without the training checkpoint - artifact is all there is
+        return True
+    if not fingerprint:
+        return False
+
+    stat = os.stat(checkpoint_path)
+    if stat.st_size != fingerprint.get("size"):
+        return False
+    if stat.st_mtime_ns == fingerprint.get("mtime_ns"):
+        return True
+    return file_sha256(checkpoint_path) == fingerprint.get("sha256")
+
+
+def fingerprint_path(artifact_path):
+    """config/resnet34.onnx -> config/resnet34.onnx.source.json"""
+    return f"{artifact_path}.source.json"
+
+
+def write_fingerprint(artifact_path, checkpoint_path):
+    """
+    Records source checkpoint of an exported model (TorchScript, ONNX) in a
+    small JSON file next to it.
+    """
+    with open(fingerprint_path(artifact_path), "w") as f:
+        json.dump(checkpoint_fingerprint(checkpoint_path), f)
+
+
+def artifact_matches_checkpoint(artifact_path, checkpoint_path):
+    """
+    Checks fingerprint written by write_fingerprint against the checkpoint.
+    """
+    path = fingerprint_path(artifact_path)
+    if not os.path.exists(path):
+        return matches_checkpoint(None, checkpoint_path)
+
+    with open(path) as f:
+        fingerprint = json.load(f)
+    if not matches_checkpoint(fingerprint, checkpoint_path):
+        return False
+
+    # Same content under a new mtime (copied, deployed) - record it, so next
+    # start compares mtime only instead of hashing again
+    mtime_ns = os.stat(checkpoint_path).st_mtime_ns if os.path.exists(
+        checkpoint_path
+    ) else fingerprint.get("mtime_ns")
+    if fingerprint.get("mtime_ns") != mtime_ns:
+        fingerprint["mtime_ns"] = mtime_ns
+        try:
+            with open(path, "w") as f:
+                json.dump(fingerprint, f)
+        except OSError:
+            pass  # Read-only install - hash again next start
+    return True
+
+
+def export_inference_checkpoint(checkpoint_path, output_path=None):
+    """
+    Converts training checkpoint into a compact inference artifact: model
+    weights plus a small metadata header made only of plain Python types, so it
+    can be loaded with `weights_only=True` and memory mapped.
+
+    Args:
+        checkpoint_path: Training checkpoint (dict with weights, mean, std, image_size)
+        output_path: Target file, defaults to <checkpoint>_inference.pth
+
+    Returns:
+        Path of the exported file
+    """
+    output_path = output_path or inference_checkpoint_path(checkpoint_path)
+
+    checkpoint = torch.load(checkpoint_path, map_location="cpu", weights_only=False)
+
+    artifact = {
+        "format": INFERENCE_FORMAT,
+        "classes": [str(c) for c in checkpoint.get("classes", DEFAULT_CLASSES)],
+        "mean": float(checkpoint["mean"]),
+        "std": float(checkpoint["std"]),
+        "image_size": [int(s) for s in checkpoint["image_size"]],
+        # Detects artifacts left behind after retraining
+        "source": checkpoint_fingerprint(checkpoint_path),
+        # Own, contiguous storage per tensor - nothing else gets serialized
+        "weights": {
+            name: tensor.detach().contiguous().clone()
+            for name, tensor in checkpoint["weights"].items()
+        },
+    }
+
+    torch.save(artifact, output_path)
+
+    print(
+        f"Exported {checkpoint_path} ({os.path.getsize(checkpoint_path) / 1e6:.1f} MB) "
+        f"-> {output_path} ({os.path.getsize(output_path) / 1e6:.1f} MB)"
+    )
+
+    return output_path
+
+
+def load_inference_checkpoint(path):
+    """
+    Loads inference artifact without unpickling arbitrary objects. Tensors are
+    memory mapped (pages are shared between processes until written).
+    """
+    checkpoint = torch.load(path, map_location="cpu", mmap=True, weights_only=True)
+
+    if checkpoint.get("format") != INFERENCE_FORMAT:
+        raise ValueError(f"{path} is not an inference checkpoint")
+
+    return checkpoint
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Export training checkpoint to inference format"
+    )
+    parser.add_argument(
+        "checkpoint", help="Training checkpoint, e.g. config/resnet34.pth"
+    )
+    parser.add_argument("-o", "--output", default=None, help="Output path")
+    args = parser.parse_args()
+
+    export_inference_checkpoint(args.checkpoint, args.output)
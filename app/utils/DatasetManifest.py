@@ -0,0 +1,173 @@
+import os
+import sqlite3
+
+import numpy as np
+
+
+class DatasetManifest:
+    """
+    On-disk (SQLite) manifest of dataset files. Entries are keyed by path and
+    stay valid while file size and mtime match, so content hashes and
+    per-image statistics are computed only for new or changed files.
+    """
+
+    def __init__(self, db_path="dataset_manifest.sqlite"):
+        """
+        Args:
+            db_path: SQLite database file, created if missing
+        """
+        self.db_path = db_path
+        self.conn = sqlite3.connect(db_path)
+
+        with self.conn:
+            self.conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS files (
+                    path TEXT PRIMARY KEY,
+                    size INTEGER NOT NULL,
+                    mtime_ns INTEGER NOT NULL,
+                    content_hash BLOB
+                )
+                """
+            )
+            # 256-bin grayscale histogram per picture (and preprocessing)
+            self.conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS image_stats (
+                    path TEXT NOT NULL,
+                    equalize INTEGER NOT NULL,
+                    mean REAL NOT NULL,
+                    std REAL NOT NULL,
+                    histogram BLOB NOT NULL,
+                    PRIMARY KEY (path, equalize)
+                )
+                """
+            )
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def close(self):
+        self.conn.close()
+
+    def sync(self, file_paths):
+        """
+        Registers files, invalidating cached data of changed ones and
+        dropping entries of files removed from the disk.
+
+        Args:
+            file_paths: Dataset files
+
+        Returns:
+            List of new or changed files
+        """
+        known = {
+            path: (size, mtime_ns)
+            for path, size, mtime_ns in self.conn.execute(
+                "SELECT path, size, mtime_ns FROM files"
+            )
+        }
+
+        changed = []
+        rows = []
+        for filepath in file_paths:
+            stat = os.stat(filepath)
+            if known.get(filepath) != (stat.st_size, stat.st_mtime_ns):
+                changed.append(filepath)
+                rows.append((filepath, stat.st_size, stat.st_mtime_ns))
+
+        removed = [(path,) for path in known if not os.path.exists(path)]
+
+        with self.conn:
+            # Changed file - cached hash and stats are stale
+            self.conn.executemany(
+                "DELETE FROM image_stats WHERE path = ?", [row[:1] for row in rows]
+            )
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO files (path, size, mtime_ns) VALUES (?, ?, ?)",
+                rows,
+            )
+            self.conn.executemany("DELETE FROM image_stats WHERE path = ?", removed)
+            self.conn.executemany("DELETE FROM files WHERE path = ?", removed)
+
+        print(
+            f"Manifest: {len(file_paths)} files, {len(changed)} new or changed, "
+            f"{len(removed)} removed"
+        )
+        return changed
+
+    def _select(self, query, file_paths):
+        """Runs `query` (selecting path first) for file_paths in chunks"""
+        file_paths = list(file_paths)
+        rows = []
+        # SQLite limits number of bound parameters
+        for start in range(0, len(file_paths), 500):
+            chunk = file_paths[start : start + 500]
+            placeholders = ",".join("?" * len(chunk))
+            rows.extend(self.conn.execute(query.format(placeholders), chunk))
+        return rows
+
+    def get_content_hashes(self, file_paths):
+        """Returns {filepath: content hash} of files with a cached hash"""
+        return dict(
+            self._select(
+                "SELECT path, content_hash FROM files "
+                "WHERE path IN ({}) AND content_hash IS NOT NULL",
+                file_paths,
+            )
+        )
+
+    def set_content_hashes(self, hashes):
+        """Stores {filepath: content hash}"""
+        with self.conn:
+            self.conn.executemany(
+                "UPDATE files SET content_hash = ? WHERE path = ?",
+                [(hash_value, path) for path, hash_value in hashes.items()],
+            )
+
+    def get_image_stats(self, file_paths, equalize=False):
+        """
+        Returns:
+            Dictionary {filepath: {"mean", "std", "histogram"}} of files with
+            cached statistics
+        """
+        rows = self._select(
+            "SELECT path, mean, std, histogram FROM image_stats "
+            f"WHERE path IN ({{}}) AND equalize = {int(equalize)}",
+            file_paths,
+        )
+        return {
+            path: {
+                "mean": mean,
+                "std": std,
+                "histogram": np.frombuffer(histogram, dtype=np.int64),
+            }
+            for path, mean, std, histogram in rows
+        }
+
+    def set_image_stats(self, image_stats, equalize=False):
+        """
+        Stores per-image statistics.
+
+        Args:
+            image_stats: {filepath: {"mean", "std", "histogram"}}
+            equalize: Statistics of histogram-equalized pictures
+        """
+        with self.conn:
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO image_stats "
+                "(path, equalize, mean, std, histogram) VALUES (?, ?, ?, ?, ?)",
+                [
+                    (
+                        path,
+                        int(equalize),
+                        float(stats["mean"]),
+                        float(stats["std"]),
+                        np.asarray(stats["histogram"], dtype=np.int64).tobytes(),
+                    )
+                    for path, stats in image_stats.items()
+                ],
+            )
@@ -1,5 +1,7 @@
 import numpy as np
 
+from .StreamingStats import StreamingStats
+
 
 class DatasetStatistics:
     """
@@ -8,79 +10,141 @@ class DatasetStatistics:
 
     def __init__(self, images=None):
         """
-        Initialize with optional list of grayscale images
+        Initialize with optional grayscale images
 
         Args:
-            images: List of numpy arrays (grayscale images)
+            images: Iterable of numpy arrays (grayscale images) - a list or a
+                generator such as ImageProcessor.iter_grayscale_images()
         """
         self.images = images
         self.stats = None
+        self.accumulator = None
 
-    def calculate_mean(self):
+    def accumulate(self, images=None):
         """
-        Calculate mean pixel intensity across all images
+        Feed images one by one into a streaming accumulator (single pass,
+        no pixel is kept)
+
+        Args:
+            images: Iterable of grayscale images or (filepath, image) tuples
+                (default: images given in the constructor)
 
         Returns:
-            Float representing mean pixel value
+            StreamingStats
         """
-        if self.images is None:
+        images = self.images if images is None else images
+        if images is None:
             raise ValueError("No images provided")
 
-        means = []
+        accumulator = StreamingStats()
+        for img in images:
+            if isinstance(img, tuple):
+                img = img[1]
+            accumulator.update(img)
+
+        self.accumulator = accumulator
+        return accumulator
+
+    def calculate_mean(self):
+        """
+        Calculate mean pixel intensity across all images
 
-        for img in self.images:
-            means.append(np.mean(img))
+        Returns:
+            Float representing mean of the image means
+        """
+        if self.accumulator is None:
+            self.accumulate()
 
-        return np.mean(means)
+        return self.accumulator.mean_of_image_means
 
     def calculate_std(self, mean=None):
         """
         Calculate standard deviation of pixel intensities
 
         Args:
-            mean: Pre-calculated mean (optional)
+            mean: Unused, kept for compatibility (exact variance is
+                accumulated in the same pass)
 
         Returns:
             Float representing standard deviation
         """
-        if self.images is None:
-            raise ValueError("No images provided")
-
-        if mean is None:
-            mean = self.calculate_mean()
-
-        all_pixels = []
-        for img in self.images:
-            all_pixels.extend(img.flatten())
+        if self.accumulator is None:
+            self.accumulate()
 
-        all_pixels = np.array(all_pixels)
-        return np.std(all_pixels)
+        return self.accumulator.std
 
-    def compute_stats(self):
+    def compute_stats(self, accumulator=None):
         """
-        Compute comprehensive statistics for the dataset
+        Compute comprehensive statistics for the dataset in a single pass
+
+        Args:
+            accumulator: Already filled StreamingStats, e.g. merged from
+                parallel workers (default: accumulate images)
 
         Returns:
             Dictionary with mean, std, min, max, median values
         """
-        if self.images is None:
-            raise ValueError("No images provided")
-
-        mean = self.calculate_mean()
-        std = self.calculate_std(mean)
-
-        all_pixels = np.concatenate([img.flatten() for img in self.images])
+        if accumulator is not None:
+            self.accumulator = accumulator
+        elif self.accumulator is None:
+            self.accumulate()
 
+        acc = self.accumulator
         self.stats = {
-            "mean": mean,
-            "std": std,
-            "min": np.min(all_pixels),
-            "max": np.max(all_pixels),
-            "median": np.median(all_pixels),
+            "mean": acc.mean_of_image_means,
+            "std": acc.std,
+            "min": acc.min,
+            "max": acc.max,
+            "median": acc.median,
         }
 
         return self.stats
 
+    @staticmethod
+    def image_stats(img):
+        """
+        Per-image statistics cached in DatasetManifest
+
+        Args:
+            img: Grayscale uint8 image
+
+        Returns:
+            Dictionary with mean, std and 256-bin histogram
+        """
+        return {
+            "mean": float(np.mean(img)),
+            "std": float(np.std(img)),
+            "histogram": np.bincount(img.ravel(), minlength=256),
+        }
+
+    def compute_stats_from_manifest(self, manifest, file_paths, equalize=False):
+        """
+        Compute the same statistics as compute_stats from per-image
+        histograms cached in DatasetManifest - no image is decoded
+
+        Args:
+            manifest: DatasetManifest filled by ImageProcessor.update_manifest_stats()
+            file_paths: Files included in the statistics
+            equalize: Use statistics of histogram-equalized images
+
+        Returns:
+            Dictionary with mean, std, min, max, median values
+        """
+        image_stats = manifest.get_image_stats(file_paths, equalize)
+
+        missing = len(set(file_paths) - image_stats.keys())
+        if missing:
+            raise ValueError(
+                f"{missing} files have no cached statistics, "
+                "run ImageProcessor.update_manifest_stats() first"
+            )
+
+        accumulator = StreamingStats()
+        for stats in image_stats.values():
+            accumulator.add_histogram(stats["histogram"], stats["mean"])
+
+        return self.compute_stats(accumulator)
+
     def print_stats(self):
         """Print statistics in a formatted table"""
 
@@ -1,47 +1,109 @@
 import filecmp
+import hashlib
 import os
+from concurrent.futures import ThreadPoolExecutor
+
 import cv2
 import matplotlib.pyplot as plt
+import numpy as np
+
+from .BKTree import BKTree
 
 
 class DuplicateDetector:
-    """Detect and manage duplicate images using file comparison"""
+    """Detect and manage duplicate images using hash grouping and file comparison"""
+
+    # Bytes read from the start of a file for the cheap pre-filter hash
+    PARTIAL_HASH_SIZE = 16 * 1024
+    CHUNK_SIZE = 1024 * 1024
+    HASH_METHODS = ("ahash", "dhash", "phash")
 
     def __init__(self, file_paths=None):
         self.file_paths = file_paths or []
         self.duplicates = []
+        # Original file -> list of its byte-identical duplicates
+        self.duplicate_groups = {}
+        # (original, near duplicate, Hamming distance)
+        self.near_duplicates = []
+        self.hashes = {}
 
-    def detect_duplicates(self, show_first_n=10):
+    def detect_duplicates(self, show_first_n=10, manifest=None):
         """
-        Detect duplicate files
+        Detect duplicate files. Files are grouped by size, then by hash of the
+        first bytes, then by full content hash; only files sharing all three
+        are compared byte by byte. The first file (in file_paths order) of
+        each group is kept as the original.
 
         Args:
             show_first_n: Number of duplicate pairs to visualize
+            manifest: DatasetManifest - content hashes of unchanged files are
+                reused, only new or changed files are read (and compared byte
+                by byte with their group)
         """
-
-        duplicates = []
-        counter = 0
         total_files = len(self.file_paths)
-
         print(f"\nChecking {total_files} files for duplicates...")
 
-        for file1 in self.file_paths:
-            if file1 in duplicates:
-                continue
+        # Same content implies same size - most files are unique already here
+        candidates = self._group_by(
+            dict.fromkeys(self.file_paths), os.path.getsize
+        )
 
-            counter += 1
-            if counter % 100 == 0:
-                print(f"Checked {counter} out of {total_files} files")
+        new_hashes = None
+        if manifest is None:
+            candidates = self._regroup(candidates, self._partial_hash)
+            candidates = self._regroup(candidates, self._full_hash)
+        else:
+            paths = [filepath for group in candidates for filepath in group]
+            hashes = manifest.get_content_hashes(paths)
+            new_hashes = {
+                filepath: self._full_hash(filepath)
+                for filepath in paths
+                if filepath not in hashes
+            }
+            manifest.set_content_hashes(new_hashes)
+            hashes.update(new_hashes)
+
+            print(
+                f"Hashed {len(new_hashes)} files, "
+                f"{len(paths) - len(new_hashes)} taken from manifest"
+            )
+            candidates = self._regroup(candidates, hashes.__getitem__)
+
+        duplicate_groups = {}
+        for group in candidates:
+            if new_hashes is not None and not any(f in new_hashes for f in group):
+                # Unchanged since an earlier run - stored hashes were already
+                # compared byte by byte then
+                duplicate_groups[group[0]] = group[1:]
+                continue
 
-            for file2 in self.file_paths:
-                if file1 != file2 and file2 not in duplicates:
-                    if filecmp.cmp(file1, file2, shallow=False):
-                        duplicates.append(file2)
+            originals = []
+            for filepath in group:
+                # Guard against hash collisions
+                original = next(
+                    (o for o in originals if filecmp.cmp(o, filepath, shallow=False)),
+                    None,
+                )
+                if original is None:
+                    originals.append(filepath)
+                else:
+                    duplicate_groups.setdefault(original, []).append(filepath)
 
-                        if len(duplicates) <= show_first_n:
-                            self._show_duplicate_pair(file1, file2)
+        # Keep input order of the files
+        order = {filepath: i for i, filepath in enumerate(self.file_paths)}
+        self.duplicate_groups = duplicate_groups
+        self.duplicates = sorted(
+            (dup for dups in duplicate_groups.values() for dup in dups),
+            key=order.__getitem__,
+        )
 
-        self.duplicates = duplicates
+        shown = 0
+        for original, dups in duplicate_groups.items():
+            for dup in dups:
+                if shown >= show_first_n:
+                    break
+                self._show_duplicate_pair(original, dup)
+                shown += 1
 
         print("=" * 60)
         print(f"SUMMARY: Found {len(self.duplicates)} duplicate files")
@@ -49,7 +111,157 @@ class DuplicateDetector:
 
     def get_unique_files(self):
         """Get list of files with duplicates removed"""
-        return [f for f in self.file_paths if f not in self.duplicates]
+        duplicates = set(self.duplicates)
+        return [f for f in self.file_paths if f not in duplicates]
+
+    @staticmethod
+    def _group_by(file_paths, key):
+        """Buckets files by key, returns only buckets with 2+ files"""
+        buckets = {}
+        for filepath in file_paths:
+            buckets.setdefault(key(filepath), []).append(filepath)
+
+        return [bucket for bucket in buckets.values() if len(bucket) > 1]
+
+    def _regroup(self, groups, key):
+        """Splits every group further by key"""
+        return [bucket for group in groups for bucket in self._group_by(group, key)]
+
+    def _partial_hash(self, filepath):
+        with open(filepath, "rb") as f:
+            return hashlib.blake2b(f.read(self.PARTIAL_HASH_SIZE)).digest()
+
+    def _full_hash(self, filepath):
+        digest = hashlib.blake2b()
+        with open(filepath, "rb") as f:
+            for chunk in iter(lambda: f.read(self.CHUNK_SIZE), b""):
+                digest.update(chunk)
+
+        return digest.digest()
+
+    @staticmethod
+    def perceptual_hash(filepath, method="phash", hash_size=8):
+        """
+        64-bit (hash_size**2) perceptual hash, stable under re-encoding and
+        resizing. Returns None if the file can't be read.
+
+        Args:
+            method: "ahash" (mean), "dhash" (gradient) or "phash" (DCT)
+        """
+        img = cv2.imread(filepath, cv2.IMREAD_GRAYSCALE)
+        if img is None:
+            return None
+
+        if method == "ahash":
+            small = cv2.resize(
+                img, (hash_size, hash_size), interpolation=cv2.INTER_AREA
+            )
+            bits = small > small.mean()
+        elif method == "dhash":
+            small = cv2.resize(
+                img, (hash_size + 1, hash_size), interpolation=cv2.INTER_AREA
+            )
+            bits = small[:, 1:] > small[:, :-1]
+        elif method == "phash":
+            small = cv2.resize(
+                img, (hash_size * 4, hash_size * 4), interpolation=cv2.INTER_AREA
+            )
+            dct = cv2.dct(np.float32(small))[:hash_size, :hash_size]
+            # DC term (overall brightness) left out of the median
+            bits = dct > np.median(dct.flatten()[1:])
+        else:
+            raise ValueError(f"Unknown hash method: {method}")
+
+        return int("".join("1" if bit else "0" for bit in bits.flatten()), 2)
+
+    def compute_hashes(self, file_paths=None, method="phash", num_workers=None):
+        """
+        Perceptual hashes computed in parallel (OpenCV releases the GIL while
+        decoding).
+
+        Returns:
+            Dictionary {filepath: hash}, unreadable files are skipped
+        """
+        file_paths = self.file_paths if file_paths is None else file_paths
+        num_workers = num_workers or min(8, os.cpu_count() or 1)
+
+        with ThreadPoolExecutor(max_workers=num_workers) as pool:
+            hashes = pool.map(
+                lambda filepath: self.perceptual_hash(filepath, method),
+                file_paths,
+            )
+            return {
+                filepath: hash_value
+                for filepath, hash_value in zip(file_paths, hashes)
+                if hash_value is not None
+            }
+
+    def detect_near_duplicates(
+        self, max_distance=6, method="phash", show_first_n=10, num_workers=None
+    ):
+        """
+        Detect re-encoded/resized copies of the same picture. Each file is
+        looked up in a BK-tree of already kept files, so no pairwise scan
+        is needed.
+
+        Args:
+            max_distance: Max Hamming distance of 64-bit hashes to count as copy
+            method: Perceptual hash, see perceptual_hash
+            show_first_n: Number of near duplicate pairs to visualize
+            num_workers: Threads computing hashes
+        """
+        print(f"\nHashing {len(self.file_paths)} files ({method})...")
+        self.hashes = self.compute_hashes(method=method, num_workers=num_workers)
+
+        tree = BKTree()
+        near_duplicates = []
+        for filepath, hash_value in self.hashes.items():
+            matches = tree.search(hash_value, max_distance)
+            if matches:
+                distance, original = matches[0]
+                near_duplicates.append((original, filepath, distance))
+            else:
+                tree.add(hash_value, filepath)
+
+        self.near_duplicates = near_duplicates
+
+        for original, filepath, _ in near_duplicates[:show_first_n]:
+            self._show_duplicate_pair(original, filepath)
+
+        print("=" * 60)
+        print(f"SUMMARY: Found {len(near_duplicates)} near duplicate files")
+        print("=" * 60)
+
+        return near_duplicates
+
+    def find_split_leaks(
+        self, train_files, test_files, max_distance=6, method="phash", num_workers=None
+    ):
+        """
+        Finds test pictures that are (near) copies of training pictures.
+
+        Returns:
+            List of (test file, closest training file, Hamming distance)
+        """
+        train_hashes = self.compute_hashes(train_files, method, num_workers)
+        test_hashes = self.compute_hashes(test_files, method, num_workers)
+
+        tree = BKTree()
+        for filepath, hash_value in train_hashes.items():
+            tree.add(hash_value, filepath)
+
+        leaks = []
+        for filepath, hash_value in test_hashes.items():
+            matches = tree.search(hash_value, max_distance)
+            if matches:
+                distance, train_file = matches[0]
+                leaks.append((filepath, train_file, distance))
+
+        print(
+            f"Found {len(leaks)} of {len(test_hashes)} test files "
+            f"leaking from the training set"
+        )
+        return leaks
 
     def remove_duplicates_from_disk(self):
         """
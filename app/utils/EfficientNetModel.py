@@ -6,11 +6,18 @@ from torchvision.models import EfficientNet_B0_Weights
 class EfficientNetModel(nn.Module):
     """EfficientNet Model with pretrained ImageNet weights for brain tumor classification"""
 
-    def __init__(self, number_of_classes=4, freeze_features=False):
+    def __init__(self, number_of_classes=4, freeze_features=False, pretrained=True):
+        """
+        Args:
+            number_of_classes: Size of the classification head
+            freeze_features: Train only the classification head
+            pretrained: Load ImageNet weights. Use False for inference, when
+                the weights are replaced by a checkpoint anyway (no download)
+        """
         super().__init__()
 
         self.model = models.efficientnet_b0(
-            weights=EfficientNet_B0_Weights.IMAGENET1K_V1
+            weights=EfficientNet_B0_Weights.IMAGENET1K_V1 if pretrained else None
         )
 
         if freeze_features:
@@ -1,55 +1,376 @@
+import argparse
+import os
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+
 import torch
 import torch.nn.functional as F
 import cv2
 import numpy as np
 
 
-def generate_gradcam(model, img_tensor, original_img, device):
+CAM_METHODS = ("gradcam", "gradcam++", "scorecam")
+
+
+def compute_cam(
+    activations,
+    grads=None,
+    method="gradcam",
+    model=None,
+    img_tensors=None,
+    class_indices=None,
+    chunk_size=64,
+):
     """
-    Generates GradCAM + overlay.
+    Class activation maps for a batch as one tensor expression.
+
+    Args:
+        activations: Target layer activations [N, K, h, w]
+        grads: Gradients of the target class score w.r.t. activations
+            (gradcam, gradcam++)
+        method: "gradcam", "gradcam++" or "scorecam"
+        model, img_tensors, class_indices: Forward pass inputs for scorecam
+            (channel weights come from masked input scores, not gradients)
+        chunk_size: Masked pictures per scorecam forward pass
+
+    Returns:
+        CAMs [N, h, w] normalized to 0..1
     """
-    model.eval()
-    img_tensor = (
-        img_tensor.unsqueeze(0).to(device)
-        if img_tensor.dim() == 3
-        else img_tensor.to(device)
-    )
+    if method == "gradcam":
+        weights = grads.mean(dim=(2, 3), keepdim=True)
 
-    # Forward pass
-    out = model(img_tensor)
-    probs = F.softmax(out, dim=1)
-    class_index = out.argmax(dim=1).item()
-    confidence = probs[0, class_index].item()
+    elif method == "gradcam++":
+        grads_2 = grads.pow(2)
+        grads_3 = grads_2 * grads
+        denominator = 2 * grads_2 + activations.sum(dim=(2, 3), keepdim=True) * grads_3
+        alphas = grads_2 / torch.where(
+            denominator != 0, denominator, torch.ones_like(denominator)
+        )
+        weights = (alphas * F.relu(grads)).sum(dim=(2, 3), keepdim=True)
 
-    # Backward pass
-    model.zero_grad()
-    out[:, class_index].backward()
+    elif method == "scorecam":
+        weights = scorecam_weights(
+            model, img_tensors, activations, class_indices, chunk_size
+        )
 
-    # Grad-CAM
-    grads = model.get_activations_gradient()
-    pooled_grads = torch.mean(grads, dim=[0, 2, 3])
-    activations = model.get_activations().clone()
+    else:
+        raise ValueError(f"Unknown CAM method: {method} (use one of {CAM_METHODS})")
 
-    for i in range(activations.shape[1]):
-        activations[:, i, :, :] *= pooled_grads[i]
+    cams = F.relu((weights * activations).mean(dim=1))
+    return cams / cams.amax(dim=(1, 2), keepdim=True).clamp_min(1e-8)
 
-    heatmap = torch.mean(activations, dim=1).squeeze()
-    heatmap = F.relu(heatmap)
-    heatmap /= heatmap.max()
-    heatmap = heatmap.cpu().numpy()
 
-    # Resize & overlay
-    heatmap_resized = cv2.resize(
-        heatmap, (original_img.shape[1], original_img.shape[0])
-    )
+def scorecam_weights(model, img_tensors, activations, class_indices, chunk_size=64):
+    """
+    Score-CAM channel weights: target class probability of the picture masked
+    by each upsampled, min-max normalized activation map.
+
+    Returns:
+        Weights [N, K, 1, 1]
+    """
+    n, k = activations.shape[:2]
+    weights = torch.empty(n, k, device=activations.device)
+
+    with torch.no_grad():
+        for i in range(n):
+            for start in range(0, k, chunk_size):
+                # Masks of one chunk only - all N x K of them at input
+                # resolution would take gigabytes
+                masks = F.interpolate(
+                    activations[i, start : start + chunk_size, None],
+                    size=img_tensors.shape[2:],
+                    mode="bilinear",
+                    align_corners=False,
+                )
+                low = masks.amin(dim=(2, 3), keepdim=True)
+                high = masks.amax(dim=(2, 3), keepdim=True)
+                masks = masks.sub_(low).div_((high - low).clamp_min(1e-8))
+
+                probs = F.softmax(model(img_tensors[i] * masks), dim=1)
+                weights[i, start : start + chunk_size] = probs[:, class_indices[i]]
+
+    return weights[:, :, None, None]
+
+
+def overlay_heatmap(cam, original_img):
+    """
+    Resizes normalized CAM to the picture, colors it and blends both.
+
+    Returns:
+        Tuple (colored heatmap, superimposed picture)
+    """
+    heatmap_resized = cv2.resize(cam, (original_img.shape[1], original_img.shape[0]))
     heatmap_uint8 = (heatmap_resized * 255).astype(np.uint8)
     heatmap_colored = cv2.applyColorMap(heatmap_uint8, cv2.COLORMAP_JET)
 
     superimposed = cv2.addWeighted(original_img, 0.6, heatmap_colored, 0.4, 0)
 
+    return heatmap_colored, superimposed
+
+
+# Last convolutional block of each wrapped backbone
+DEFAULT_TARGET_LAYERS = {
+    "ResNet34Model": "model.layer4",
+    "VGG16Model": "model.features.29",
+    "EfficientNetModel": "model.features.8",
+}
+
+
+class GradCAMExplainer:
+    """
+    Grad-CAM for any wrapped backbone. Hooks on the target layer exist only
+    while an explanation runs, so prediction through the same model stays
+    hook-free.
+    """
+
+    def __init__(self, model, target_layer=None):
+        """
+        Args:
+            model: ResNet34Model, VGG16Model, EfficientNetModel or any module
+            target_layer: Module or dotted name (e.g. "model.layer4"),
+                default from DEFAULT_TARGET_LAYERS
+        """
+        self.model = model
+
+        if target_layer is None:
+            model_name = type(model).__name__
+            if model_name not in DEFAULT_TARGET_LAYERS:
+                raise ValueError(f"No default Grad-CAM target layer for {model_name}")
+            target_layer = DEFAULT_TARGET_LAYERS[model_name]
+        if isinstance(target_layer, str):
+            target_layer = model.get_submodule(target_layer)
+        self.target_layer = target_layer
+
+        self.activations = None
+
+    def _save_activations(self, module, input, output):
+        # Kept attached to the graph - gradients are taken w.r.t. it directly
+        self.activations = output
+
+    @contextmanager
+    def hooks(self):
+        """Target layer hook registered for the duration of the block"""
+        handle = self.target_layer.register_forward_hook(self._save_activations)
+        try:
+            yield self
+        finally:
+            handle.remove()
+            self.activations = None
+
+    def explain_batch(self, img_tensors, target_classes=None, method="gradcam"):
+        """
+        CAMs for a mini-batch in one forward and one backward pass (Score-CAM
+        skips the backward pass).
+
+        Args:
+            img_tensors: Stacked pictures [N, C, H, W] (or single [C, H, W])
+            target_classes: Class index per picture (default: predicted class)
+            method: CAM variant, see compute_cam
+
+        Returns:
+            Tuple (cams [N, h, w] normalized to 0..1 numpy array,
+            class indices list, probabilities list)
+        """
+        self.model.eval()
+        device = next(self.model.parameters()).device
+        if img_tensors.dim() == 3:
+            img_tensors = img_tensors.unsqueeze(0)
+        # Score-CAM weights come from forward passes only - no backward
+        needs_grads = method != "scorecam"
+        # Graph is recorded even for frozen backbones
+        img_tensors = img_tensors.to(device).detach().requires_grad_(needs_grads)
+
+        with self.hooks(), torch.set_grad_enabled(needs_grads):
+            # Forward pass
+            out = self.model(img_tensors)
+            probs = F.softmax(out, dim=1)
+            if target_classes is None:
+                class_indices = out.argmax(dim=1)
+            else:
+                class_indices = torch.as_tensor(target_classes, device=device)
+            confidences = probs.gather(1, class_indices.unsqueeze(1)).squeeze(1)
+
+            # Backward pass - one-hot seed selects each sample's own target
+            # class (samples are independent in eval mode, gradients don't mix).
+            # Only the part of the graph above the target layer is traversed
+            # and no parameter .grad is accumulated
+            activations = self.activations
+            grads = None
+            if needs_grads:
+                one_hot = F.one_hot(class_indices, num_classes=out.shape[1])
+                grads = torch.autograd.grad(
+                    out, activations, grad_outputs=one_hot.to(out.dtype)
+                )[0]
+            activations = activations.detach()
+
+        # Score-CAM runs its own (hook-free) forward passes
+        cams = compute_cam(
+            activations,
+            grads,
+            method=method,
+            model=self.model,
+            img_tensors=img_tensors,
+            class_indices=class_indices.tolist(),
+        )
+
+        return (
+            cams.cpu().numpy(),
+            class_indices.tolist(),
+            confidences.detach().cpu().tolist(),
+        )
+
+    def explain(self, img_tensor, original_img, method="gradcam"):
+        """
+        Generates GradCAM + overlay for a single picture.
+        """
+        cams, class_indices, confidences = self.explain_batch(
+            img_tensor, method=method
+        )
+        return gradcam_result(cams[0], original_img, class_indices[0], confidences[0])
+
+
+def gradcam_result(cam, original_img, class_index, confidence):
+    """
+    Result dictionary of a single picture explanation.
+    """
+    heatmap_colored, superimposed = overlay_heatmap(cam, original_img)
+
     return {
         "class_index": class_index,
         "probability": confidence,
         "heatmap": heatmap_colored,
         "superimposed": superimposed,
     }
+
+
+def generate_gradcam(model, img_tensor, original_img, device, method="gradcam"):
+    """
+    Generates GradCAM + overlay.
+    """
+    return GradCAMExplainer(model.to(device)).explain(
+        img_tensor, original_img, method=method
+    )
+
+
+def save_overlay(original, cam, output_path):
+    """
+    Overlays the heatmap on the resized RGB picture and writes it to disk.
+    """
+    original = cv2.cvtColor(original, cv2.COLOR_RGB2BGR)
+    _, superimposed = overlay_heatmap(cam, original)
+
+    os.makedirs(os.path.dirname(output_path), exist_ok=True)
+    cv2.imwrite(output_path, superimposed)
+    return output_path
+
+
+def generate_gradcam_folder(
+    classifier, data_dir, output_dir, batch_size=32, num_workers=None, method="gradcam"
+):
+    """
+    Writes Grad-CAM overlays for every picture in data_dir (class subfolders)
+    to output_dir with the same structure. Pictures are decoded by the
+    classifier's prefetching loader, overlays are written by a thread pool
+    while the next mini-batch is on the model.
+
+    Args:
+        classifier: BrainTumorClassifier (its fp32 model explainer is used)
+        data_dir: Folder with class subfolders, e.g. new_data/Testing
+        output_dir: Destination folder for overlays
+        batch_size: Pictures per forward/backward pass
+        num_workers: Threads writing overlays (default: classifier's workers)
+        method: CAM variant, see compute_cam
+
+    Returns:
+        (results, skipped): results is a list of dictionaries (filepath,
+        output, class_name, probability), skipped a list of (filepath, error)
+        for pictures that could not be read or written - they do not stop
+        the run
+    """
+    img_paths = sorted(
+        os.path.join(root, filename)
+        for root, _, filenames in os.walk(data_dir)
+        for filename in filenames
+        if filename.lower().endswith((".jpg", ".jpeg", ".png"))
+    )
+
+    results = []
+    skipped = []
+    futures = []
+
+    def skip(img_path, error):
+        print(f"Grad-CAM: skipping {img_path}: {error}")
+        skipped.append((img_path, str(error)))
+
+    with ThreadPoolExecutor(
+        max_workers=num_workers or classifier.num_workers
+    ) as pool:
+        # Resized pictures come with the batch - no second decode for overlays
+        for batch_paths, img_tensors, originals in classifier.iter_batches(
+            img_paths, batch_size, with_originals=True, on_error=skip
+        ):
+            with classifier.lock:
+                cams, class_indices, confidences = classifier.explainer.explain_batch(
+                    img_tensors, method=method
+                )
+
+            for img_path, original, cam, class_index, confidence in zip(
+                batch_paths, originals, cams, class_indices, confidences
+            ):
+                output_path = os.path.join(
+                    output_dir, os.path.relpath(img_path, data_dir)
+                )
+                future = pool.submit(save_overlay, original, cam, output_path)
+                futures.append((future, img_path))
+                results.append(
+                    {
+                        "filepath": img_path,
+                        "output": output_path,
+                        "class_name": classifier.classes[class_index],
+                        "probability": confidence,
+                    }
+                )
+
+            print(f"Grad-CAM: {len(results)}/{len(img_paths)}")
+
+        # Write errors - drop the result, keep the other overlays
+        failed = set()
+        for future, img_path in futures:
+            try:
+                future.result()
+            except Exception as e:
+                skip(img_path, e)
+                failed.add(img_path)
+
+    if failed:
+        results = [result for result in results if result["filepath"] not in failed]
+
+    if skipped:
+        print(f"Grad-CAM: skipped {len(skipped)} of {len(img_paths)} pictures")
+
+    return results, skipped
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Write Grad-CAM overlays for a whole folder"
+    )
+    parser.add_argument(
+        "checkpoint", help="Training checkpoint, e.g. config/resnet34.pth"
+    )
+    parser.add_argument("data_dir", help="Folder with class subfolders")
+    parser.add_argument("output_dir", help="Destination folder for overlays")
+    parser.add_argument("--batch-size", type=int, default=32)
+    parser.add_argument("--method", choices=CAM_METHODS, default="gradcam")
+    args = parser.parse_args()
+
+    from BrainTumorClassifier import BrainTumorClassifier
+
+    classifier = BrainTumorClassifier(args.checkpoint)
+    generate_gradcam_folder(
+        classifier,
+        args.data_dir,
+        args.output_dir,
+        args.batch_size,
+        method=args.method,
+    )
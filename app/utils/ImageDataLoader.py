@@ -1,5 +1,7 @@
 import os
 
+from .DatasetManifest import DatasetManifest
+
 
 class ImageDataLoader:
     """Handles loading and organizing file paths from dataset directories"""
@@ -9,6 +11,7 @@ class ImageDataLoader:
         self.val_dir = val_dir
         self.test_dir = test_dir
         self.file_paths = []
+        self.manifest = None
 
     def set_train_dir(self, train_dir):
         """Set training directory path"""
@@ -63,6 +66,26 @@ class ImageDataLoader:
 
         return file_paths
 
+    def build_manifest(self, db_path="dataset_manifest.sqlite"):
+        """
+        Open (or create) the on-disk manifest and register all dataset files.
+        Only new or changed files lose their cached hashes and statistics.
+
+        Args:
+            db_path: SQLite database file
+
+        Returns:
+            DatasetManifest
+        """
+        if not self.file_paths:
+            self.load_all_images()
+
+        if self.manifest is None:
+            self.manifest = DatasetManifest(db_path)
+
+        self.manifest.sync(self.file_paths)
+        return self.manifest
+
     def print_dataset_class_count(self):
         """
         Print dataset structure with class counts for training and testing directories
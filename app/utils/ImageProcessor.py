@@ -1,57 +1,176 @@
+import os
+from contextlib import closing
+
 import cv2
 import matplotlib.pyplot as plt
 import numpy as np
 
+from .DatasetStatistics import DatasetStatistics
+from .Prefetch import iter_prefetched
+
 
 class ImageProcessor:
     """Handles image loading, conversion, and analysis operations"""
 
-    def __init__(self, file_paths=None):
+    def __init__(self, file_paths=None, num_workers=None):
+        """
+        Args:
+            file_paths: Image file paths
+            num_workers: Decoding threads (OpenCV releases the GIL while
+                decoding, so threads run in parallel)
+        """
         self.file_paths = file_paths
+        self.num_workers = num_workers or min(8, os.cpu_count() or 1)
         self.gray_images = None
 
-    def load_grayscale_images(self, equalize=False):
+    @staticmethod
+    def read_grayscale(filepath, equalize=False, max_size=None):
         """
-        Load all images and convert to grayscale
+        Read image as grayscale
+
+        Args:
+            filepath: Image file path
+            equalize: Apply histogram equalization
+            max_size: Downscale so the longer side is at most max_size pixels
         """
-        if self.file_paths is None:
+        img = cv2.imread(filepath)
+        gray_img = cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
+
+        if max_size is not None and max(gray_img.shape) > max_size:
+            scale = max_size / max(gray_img.shape)
+            gray_img = cv2.resize(
+                gray_img,
+                (round(gray_img.shape[1] * scale), round(gray_img.shape[0] * scale)),
+                interpolation=cv2.INTER_AREA,
+            )
+
+        if equalize:
+            gray_img = cv2.equalizeHist(gray_img)
+
+        return gray_img
+
+    def iter_grayscale_images(
+        self, file_paths=None, equalize=False, max_size=None, prefetch=64
+    ):
+        """
+        Decode images in a thread pool and yield them in order, only a
+        bounded number of images is held in memory at once
+
+        Args:
+            file_paths: Files to load (default: all file paths)
+            equalize: Apply histogram equalization
+            max_size: Downscale on load, see read_grayscale()
+            prefetch: Images decoded ahead of the consumer
+
+        Yields:
+            Tuples (filepath, grayscale image)
+        """
+        file_paths = self.file_paths if file_paths is None else file_paths
+        if file_paths is None:
+            raise ValueError("No file paths provided")
+
+        def read(filepath):
+            return self.read_grayscale(filepath, equalize, max_size)
+
+        with closing(
+            iter_prefetched(read, file_paths, self.num_workers, prefetch)
+        ) as queue:
+            for filepath, future in queue:
+                yield filepath, future.result()
+
+    def load_grayscale_images(self, equalize=False, max_size=None, limit=None):
+        """
+        Load images and convert to grayscale
+
+        Args:
+            equalize: Apply histogram equalization
+            max_size: Downscale on load, see read_grayscale()
+            limit: Load only the first `limit` images
+        """
+        file_paths = self.file_paths
+        if file_paths is None:
             raise ValueError("No file paths provided")
+        if limit is not None:
+            file_paths = file_paths[:limit]
 
         gray_images = []
-        total = len(self.file_paths)
+        total = len(file_paths)
 
         print(f"Loading {total} images and converting to grayscale...")
 
-        for i, filepath in enumerate(self.file_paths):
+        for i, (_, gray_img) in enumerate(
+            self.iter_grayscale_images(file_paths, equalize, max_size)
+        ):
             if (i + 1) % 500 == 0 or i == 0:
                 print(f"  Progress: {i + 1}/{total} images")
 
-            img = cv2.imread(filepath)
-            gray_img = cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
-
-            if equalize:
-                gray_img = cv2.equalizeHist(gray_img)
-
             gray_images.append(gray_img)
 
         self.gray_images = gray_images
         print("Images loaded")
 
-    def display_image_grid(self, batch_size=64, images_per_row=8, figsize=(12, 12)):
+    def update_manifest_stats(self, manifest, equalize=False):
+        """
+        Compute per-image statistics for files missing in the manifest
+        (new or changed since the last run) and store them
+
+        Args:
+            manifest: DatasetManifest with registered file paths
+            equalize: Apply histogram equalization before computing statistics
+
+        Returns:
+            Number of processed images
+        """
+        if self.file_paths is None:
+            raise ValueError("No file paths provided")
+
+        cached = manifest.get_image_stats(self.file_paths, equalize)
+        missing = [f for f in self.file_paths if f not in cached]
+
+        print(f"Computing statistics of {len(missing)} new or changed images...")
+
+        image_stats = {
+            filepath: DatasetStatistics.image_stats(gray_img)
+            for filepath, gray_img in self.iter_grayscale_images(
+                missing, equalize=equalize
+            )
+        }
+
+        manifest.set_image_stats(image_stats, equalize)
+        return len(missing)
+
+    def display_image_grid(
+        self,
+        batch_size=64,
+        images_per_row=8,
+        figsize=(12, 12),
+        equalize=False,
+        max_size=256,
+    ):
         """
-        Display a grid of loaded grayscale images
+        Display a grid of grayscale images. Uses loaded images if present,
+        otherwise only the displayed images are read (downscaled)
 
         Args:
             batch_size: Total number of images to display
             images_per_row: Number of images per row
             figsize: Figure size in inches
+            equalize: Apply histogram equalization (images read for the grid)
+            max_size: Downscale on load (images read for the grid)
         """
-        if self.gray_images is None:
-            raise ValueError(
-                "Load grayscale images first using load_grayscale_images()"
-            )
+        if self.gray_images is not None:
+            images = self.gray_images
+        elif self.file_paths is not None:
+            images = [
+                gray_img
+                for _, gray_img in self.iter_grayscale_images(
+                    self.file_paths[:batch_size], equalize, max_size
+                )
+            ]
+        else:
+            raise ValueError("No file paths provided")
 
-        batch_size = min(batch_size, len(self.gray_images))
+        batch_size = min(batch_size, len(images))
         n_rows = int(np.ceil(batch_size / images_per_row))
 
         fig, axs = plt.subplots(n_rows, images_per_row, figsize=figsize)
@@ -65,7 +184,7 @@ class ImageProcessor:
                     axs[row][col].axis("off")
                     continue
 
-                img = self.gray_images[idx]
+                img = images[idx]
                 axs[row][col].imshow(img, cmap="gray", aspect="equal")
                 axs[row][col].axis("off")
 
@@ -0,0 +1,88 @@
+import argparse
+import os
+
+import torch
+
+from CheckpointExporter import write_fingerprint
+
+
+def torchscript_checkpoint_path(checkpoint_path):
+    """config/resnet34.pth -> config/resnet34_scripted.pt"""
+    root, _ = os.path.splitext(checkpoint_path)
+    return f"{root}_scripted.pt"
+
+
+def onnx_checkpoint_path(checkpoint_path):
+    """config/resnet34.pth -> config/resnet34.onnx"""
+    root, _ = os.path.splitext(checkpoint_path)
+    return f"{root}.onnx"
+
+
+def export_torchscript(network, image_size, output_path):
+    """
+    Traces hook-free network to TorchScript.
+    """
+    network = network.cpu().eval()
+    example = torch.randn(1, 3, *image_size)
+
+    with torch.no_grad():
+        scripted = torch.jit.trace(network, example)
+    scripted = torch.jit.freeze(scripted)
+    torch.jit.save(scripted, output_path)
+
+    print(f"TorchScript model saved to {output_path}")
+    return output_path
+
+
+def export_onnx(network, image_size, output_path, opset_version=17):
+    """
+    Exports hook-free network to ONNX with dynamic batch dimension.
+    """
+    network = network.cpu().eval()
+    example = torch.randn(1, 3, *image_size)
+
+    torch.onnx.export(
+        network,
+        example,
+        output_path,
+        input_names=["input"],
+        output_names=["logits"],
+        dynamic_axes={"input": {0: "batch"}, "logits": {0: "batch"}},
+        opset_version=opset_version,
+        # TorchScript-based exporter: honours dynamic_axes and needs no
+        # onnx/onnxscript packages (dynamo is the default in recent torch)
+        dynamo=False,
+    )
+
+    print(f"ONNX model saved to {output_path}")
+    return output_path
+
+
+def export_all(checkpoint_path):
+    """
+    Exports classifier's prediction network to TorchScript and ONNX next to
+    the checkpoint, where BrainTumorClassifier backends look for them.
+    """
+    from BrainTumorClassifier import BrainTumorClassifier
+
+    classifier = BrainTumorClassifier(checkpoint_path, backend="eager")
+    network = classifier.inference_model
+
+    for export, output_path in (
+        (export_torchscript, torchscript_checkpoint_path(checkpoint_path)),
+        (export_onnx, onnx_checkpoint_path(checkpoint_path)),
+    ):
+        export(network, classifier.image_size, output_path)
+        write_fingerprint(output_path, checkpoint_path)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Export prediction network to TorchScript and ONNX"
+    )
+    parser.add_argument(
+        "checkpoint", help="Training checkpoint, e.g. config/resnet34.pth"
+    )
+    args = parser.parse_args()
+
+    export_all(args.checkpoint)
@@ -0,0 +1,40 @@
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+
+def iter_prefetched(fn, items, num_workers, max_pending):
+    """
+    Runs fn(item) in a thread pool, at most `max_pending` items ahead of the
+    consumer, and yields (item, future) in input order. Queued work is
+    cancelled when the consumer stops early or fails - close the generator
+    (e.g. contextlib.closing) so this happens right away.
+
+    Args:
+        fn: Function run for every item (e.g. picture decode)
+        items: Iterable of inputs, consumed lazily
+        num_workers: Threads of the pool
+        max_pending: Submitted items not yet taken by the consumer
+    """
+    items = iter(items)
+    pending = deque()
+
+    with ThreadPoolExecutor(max_workers=num_workers) as pool:
+
+        def fill_queue():
+            while len(pending) < max_pending:
+                item = next(items, None)
+                if item is None:
+                    return
+                pending.append((item, pool.submit(fn, item)))
+
+        try:
+            fill_queue()
+            while pending:
+                item, future = pending.popleft()
+                # Top up the queue before the consumer waits, so workers keep going
+                fill_queue()
+                yield item, future
+        finally:
+            # Consumer stopped early or an item failed - drop queued work
+            for _, future in pending:
+                future.cancel()
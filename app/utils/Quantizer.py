@@ -0,0 +1,188 @@
+import argparse
+import copy
+import random
+
+import torch
+from torch.ao.quantization import get_default_qconfig_mapping
+from torch.ao.quantization.quantize_fx import convert_fx, prepare_fx
+from torch.utils.data import DataLoader, Subset
+from torchvision import datasets
+
+from CheckpointExporter import quantized_checkpoint_path, write_fingerprint
+
+
+def build_calibration_loader(
+    train_dir, transform, samples_per_class=32, batch_size=16, seed=42
+):
+    """
+    Random, class-balanced sample of the training folders used to calibrate
+    activation ranges.
+    """
+    dataset = datasets.ImageFolder(train_dir, transform=transform)
+
+    indices_per_class = {}
+    for idx, (_, label) in enumerate(dataset.samples):
+        indices_per_class.setdefault(label, []).append(idx)
+
+    rng = random.Random(seed)
+    indices = []
+    for class_indices in indices_per_class.values():
+        indices.extend(
+            rng.sample(class_indices, min(samples_per_class, len(class_indices)))
+        )
+
+    return DataLoader(Subset(dataset, indices), batch_size=batch_size, shuffle=False)
+
+
+def quantize_model(model, calibration_loader, image_size, backend=None):
+    """
+    INT8 post-training static quantization (FX graph mode) of a wrapped model.
+    Works for ResNet34Model, VGG16Model and EfficientNetModel - the inner
+    torchvision network is traced, so wrapper hooks are not part of the graph.
+
+    Args:
+        model: Wrapped fp32 model with loaded weights
+        calibration_loader: DataLoader with preprocessed training images
+        image_size: (height, width) of model input
+        backend: Quantized engine, defaults to the current one (x86/fbgemm/qnnpack)
+
+    Returns:
+        Quantized torch.fx.GraphModule (CPU only)
+    """
+    backend = backend or torch.backends.quantized.engine
+    torch.backends.quantized.engine = backend
+
+    # FX rewrites the network - keep the fp32 model intact
+    network = copy.deepcopy(model.model).cpu().eval()
+    example_inputs = (torch.randn(1, 3, *image_size),)
+
+    prepared = prepare_fx(
+        network, get_default_qconfig_mapping(backend), example_inputs
+    )
+
+    # Calibration - observers record activation ranges
+    with torch.no_grad():
+        for imgs, _ in calibration_loader:
+            prepared(imgs)
+
+    return convert_fx(prepared)
+
+
+def evaluate_accuracy(network, test_loader):
+    """
+    Returns accuracy and list of predictions of a network on a test loader.
+    """
+    correct = 0
+    total = 0
+    predictions = []
+
+    with torch.no_grad():
+        for imgs, labels in test_loader:
+            predicted = network(imgs).argmax(dim=1)
+
+            total += labels.size(0)
+            correct += predicted.eq(labels).sum().item()
+            predictions.extend(predicted.tolist())
+
+    return correct / total, predictions
+
+
+def compare_with_fp32(fp32_network, int8_network, test_loader):
+    """
+    Accuracy check of the quantized model against fp32 on the test split.
+
+    Returns:
+        Dictionary with fp32/int8 accuracy, accuracy drop and prediction agreement
+    """
+    fp32_acc, fp32_preds = evaluate_accuracy(fp32_network, test_loader)
+    int8_acc, int8_preds = evaluate_accuracy(int8_network, test_loader)
+
+    agreement = sum(a == b for a, b in zip(fp32_preds, int8_preds)) / len(fp32_preds)
+
+    report = {
+        "fp32_accuracy": fp32_acc,
+        "int8_accuracy": int8_acc,
+        "accuracy_drop": fp32_acc - int8_acc,
+        "agreement": agreement,
+    }
+
+    print("Quantization check (test split):")
+    print(f"\tfp32 accuracy: {fp32_acc:.4f}")
+    print(f"\tint8 accuracy: {int8_acc:.4f}")
+    print(f"\tAccuracy drop: {report['accuracy_drop']:.4f}")
+    print(f"\tfp32/int8 agreement: {agreement:.4f}")
+
+    return report
+
+
+def export_quantized_model(
+    checkpoint_path,
+    train_dir,
+    test_dir,
+    output_path=None,
+    samples_per_class=32,
+    max_accuracy_drop=0.01,
+):
+    """
+    Calibrates, checks and saves INT8 version of the classifier's model as
+    TorchScript, so the app can load it without FX or calibration data.
+
+    Returns:
+        Accuracy report (see compare_with_fp32)
+    """
+    from BrainTumorClassifier import BrainTumorClassifier
+
+    output_path = output_path or quantized_checkpoint_path(checkpoint_path)
+
+    classifier = BrainTumorClassifier(checkpoint_path)
+    classifier.model.cpu()
+
+    calibration_loader = build_calibration_loader(
+        train_dir, classifier.transform, samples_per_class=samples_per_class
+    )
+    int8_network = quantize_model(
+        classifier.model, calibration_loader, classifier.image_size
+    )
+
+    test_loader = DataLoader(
+        datasets.ImageFolder(test_dir, transform=classifier.transform),
+        batch_size=32,
+        shuffle=False,
+    )
+    report = compare_with_fp32(classifier.model.model, int8_network, test_loader)
+
+    if report["accuracy_drop"] > max_accuracy_drop:
+        print(
+            f"Accuracy drop above {max_accuracy_drop:.4f}, quantized model not saved"
+        )
+        return report
+
+    example = torch.randn(1, 3, *classifier.image_size)
+    scripted = torch.jit.trace(int8_network, example)
+    torch.jit.save(scripted, output_path)
+    write_fingerprint(output_path, checkpoint_path)
+    print(f"INT8 model saved to {output_path}")
+
+    return report
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Export INT8 quantized model for CPU inference"
+    )
+    parser.add_argument(
+        "checkpoint", help="Training checkpoint, e.g. config/resnet34.pth"
+    )
+    parser.add_argument("train_dir", help="Training folder used for calibration")
+    parser.add_argument("test_dir", help="Testing folder used for accuracy check")
+    parser.add_argument("-o", "--output", default=None, help="Output path")
+    parser.add_argument("--samples-per-class", type=int, default=32)
+    args = parser.parse_args()
+
+    export_quantized_model(
+        args.checkpoint,
+        args.train_dir,
+        args.test_dir,
+        output_path=args.output,
+        samples_per_class=args.samples_per_class,
+    )
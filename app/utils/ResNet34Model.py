@@ -1,3 +1,4 @@
+import torch
 import torch.nn as nn
 from torchvision import models
 from torchvision.models import ResNet34_Weights
@@ -6,10 +7,28 @@ from torchvision.models import ResNet34_Weights
 class ResNet34Model(nn.Module):
     """ResNet34 Model with pretrained ImageNet weights for brain tumor classification"""
 
-    def __init__(self, number_of_classes=4, freeze_features=False):
+    def __init__(
+        self,
+        number_of_classes=4,
+        freeze_features=False,
+        pretrained=True,
+        register_hooks=False,
+    ):
+        """
+        Args:
+            number_of_classes: Size of the classification head
+            freeze_features: Train only the classification head
+            pretrained: Load ImageNet weights. Use False for inference, when
+                the weights are replaced by a checkpoint anyway (no download)
+            register_hooks: Save layer4 activations/gradients on every pass
+                (legacy Grad-CAM). Off by default - they slow down prediction
+                and training, use GradCAMExplainer instead
+        """
         super().__init__()
 
-        self.model = models.resnet34(weights=ResNet34_Weights.IMAGENET1K_V1)
+        self.model = models.resnet34(
+            weights=ResNet34_Weights.IMAGENET1K_V1 if pretrained else None
+        )
 
         if freeze_features:
             for name, param in self.model.named_parameters():
@@ -21,9 +40,22 @@ class ResNet34Model(nn.Module):
 
         self.activations = None
         self.gradients = None
+        self.hook_handles = []
+        self.set_hooks(register_hooks)
 
-        self.model.layer4.register_forward_hook(self._save_activations)
-        self.model.layer4.register_full_backward_hook(self._save_gradients)
+    def set_hooks(self, enabled):
+        """Registers (True) or removes (False) the layer4 hooks"""
+        for handle in self.hook_handles:
+            handle.remove()
+        self.hook_handles = []
+        self.activations = None
+        self.gradients = None
+
+        if enabled:
+            self.hook_handles = [
+                self.model.layer4.register_forward_hook(self._save_activations),
+                self.model.layer4.register_full_backward_hook(self._save_gradients),
+            ]
 
     def _save_activations(self, module, input, output):
         self.activations = output.detach()
@@ -34,6 +66,18 @@ class ResNet34Model(nn.Module):
     def forward(self, x):
         return self.model(x)
 
+    def forward_features(self, x):
+        """Backbone up to layer4 - activations used by Grad-CAM"""
+        m = self.model
+        x = m.maxpool(m.relu(m.bn1(m.conv1(x))))
+        x = m.layer4(m.layer3(m.layer2(m.layer1(x))))
+        return x
+
+    def forward_head(self, features):
+        """Classification head on layer4 activations"""
+        x = torch.flatten(self.model.avgpool(features), 1)
+        return self.model.fc(x)
+
     def get_activations_gradient(self):
         return self.gradients
 
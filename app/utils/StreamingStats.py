@@ -0,0 +1,125 @@
+import numpy as np
+
+
+class StreamingStats:
+    """
+    One-pass pixel statistics of uint8 grayscale images. Keeps exact count,
+    mean and sum of squared deviations (Welford/Chan) and a 256-bin
+    histogram for min, max, median and percentiles - no pixel is stored.
+    Accumulators of parallel workers are combined with merge().
+    """
+
+    VALUES = np.arange(256)
+
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.histogram = np.zeros(256, dtype=np.int64)
+        # Per-image means, for the mean of image means
+        self.image_count = 0
+        self.image_means_sum = 0.0
+
+    def update(self, img):
+        """
+        Add one image
+
+        Args:
+            img: Grayscale uint8 image
+        """
+        if img.dtype != np.uint8:
+            raise ValueError(f"Expected uint8 image, got {img.dtype}")
+
+        self.add_histogram(np.bincount(img.ravel(), minlength=256))
+
+    def add_histogram(self, histogram, image_mean=None):
+        """
+        Add one image given by its 256-bin histogram (e.g. cached in
+        DatasetManifest)
+
+        Args:
+            histogram: Pixel counts per intensity
+            image_mean: Image mean if already known
+        """
+        histogram = np.asarray(histogram, dtype=np.int64)
+        count = int(histogram.sum())
+        if count == 0:
+            return
+
+        mean = (
+            float(histogram @ self.VALUES) / count if image_mean is None else image_mean
+        )
+        m2 = float(histogram @ (self.VALUES - mean) ** 2)
+
+        self._combine(count, mean, m2, histogram)
+        self.image_count += 1
+        self.image_means_sum += mean
+
+    def merge(self, other):
+        """Add statistics of another accumulator (e.g. of a worker)"""
+        if other.count == 0:
+            return self
+
+        self._combine(other.count, other.mean, other.m2, other.histogram)
+        self.image_count += other.image_count
+        self.image_means_sum += other.image_means_sum
+        return self
+
+    def _combine(self, count, mean, m2, histogram):
+        # Chan et al. parallel update of count/mean/M2
+        total = self.count + count
+        delta = mean - self.mean
+
+        self.mean += delta * count / total
+        self.m2 += m2 + delta**2 * self.count * count / total
+        self.count = total
+        self.histogram += histogram
+
+    @property
+    def variance(self):
+        """Population variance of all pixels (as np.var)"""
+        return self.m2 / self.count if self.count else float("nan")
+
+    @property
+    def std(self):
+        return float(np.sqrt(self.variance))
+
+    @property
+    def mean_of_image_means(self):
+        if self.image_count == 0:
+            return float("nan")
+        return self.image_means_sum / self.image_count
+
+    @property
+    def min(self):
+        return int(np.flatnonzero(self.histogram)[0])
+
+    @property
+    def max(self):
+        return int(np.flatnonzero(self.histogram)[-1])
+
+    def percentile(self, q):
+        """
+        Exact percentile of all pixels with linear interpolation
+        (as np.percentile)
+
+        Args:
+            q: Percentile in 0..100
+        """
+        if self.count == 0:
+            raise ValueError("No pixels accumulated")
+
+        position = q / 100 * (self.count - 1)
+        lower = int(np.floor(position))
+        upper = int(np.ceil(position))
+
+        # Value at sorted index k: first intensity whose cumulative count > k
+        cumulative = np.cumsum(self.histogram)
+        value_lower, value_upper = np.searchsorted(
+            cumulative, [lower, upper], side="right"
+        )
+        return value_lower + (position - lower) * (value_upper - value_lower)
+
+    @property
+    def median(self):
+        return self.percentile(50)
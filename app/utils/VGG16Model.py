@@ -6,9 +6,18 @@ from torchvision.models import VGG16_Weights
 class VGG16Model(nn.Module):
     """VGG-16 Model with pretrained ImageNet weights for brain tumor classification"""
 
-    def __init__(self, number_of_classes=4, freeze_features=False):
+    def __init__(self, number_of_classes=4, freeze_features=False, pretrained=True):
+        """
+        Args:
+            number_of_classes: Size of the classification head
+            freeze_features: Train only the classification head
+            pretrained: Load ImageNet weights. Use False for inference, when
+                the weights are replaced by a checkpoint anyway (no download)
+        """
         super().__init__()
-        self.model = models.vgg16(weights=VGG16_Weights.IMAGENET1K_V1)
+        self.model = models.vgg16(
+            weights=VGG16_Weights.IMAGENET1K_V1 if pretrained else None
+        )
 
         if freeze_features:
             for param in self.model.features.parameters():